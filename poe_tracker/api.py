@@ -1,16 +1,39 @@
 from __future__ import annotations
 
+import email.utils
+import hashlib
 import json
+import random
+import sys
+import threading
 import time
-import urllib.error
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
 import urllib.parse
-import urllib.request
 import re
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, TypeVar
 
+from . import codec
+from .cache import ResolutionMemo, ResponseCache
+from .recording import ReplayError, TrafficRecorder, TrafficReplayer
+from .jsonstream import FieldProjector, decode_body, is_object, iter_members
 from .data import CurrencyEntry, CurrencySnapshot
-
-
+from .net import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ConditionalCache,
+    ConnectionPool,
+    HTTPStatusError,
+    HttpResponse,
+    SingleFlight,
+    TransportError,
+    normalize_url,
+)
+
+
+NINJA_ORIGIN = "https://poe.ninja"
 POE_API_BASE_URL = "https://poe.ninja/api/data"
 POE2_API_BASE_URL = "https://poe.ninja/poe2/api/economy"
 POE2_TEMP_OVERVIEW_URL = "https://poe.ninja/poe2/api/economy/temp/overview"
@@ -25,8 +48,27 @@ POE2_EXCHANGE_DETAILS_ENDPOINTS = [
 USER_AGENT = "poe-currency-tracker/0.1 (+https://github.com/)"
 DEFAULT_TIMEOUT = 10
 MAX_DETAIL_ENTRIES = 50
+# Exchange detail lookups run in parallel, but never more than this many at once
+# so a refresh stays polite towards poe.ninja.
+DEFAULT_DETAIL_CONCURRENCY = 4
+MAX_DETAIL_CONCURRENCY = 8
+# Process-wide request budget shared by every fetch helper (token bucket).
+DEFAULT_REQUEST_RATE = 2.0  # requests per second
+DEFAULT_REQUEST_BURST = 6
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 1.0  # seconds, doubled per attempt
+MAX_RETRY_AFTER = 120.0
+_RETRYABLE_STATUSES = {429, 503}
+# Exchange details are refetched only when their overview line changed or after this many seconds.
+DEFAULT_DETAIL_TTL = 900.0
+MAX_REMEMBERED_DETAILS = 4096
+# Consecutive failures (timeouts, connection errors, 5xx) before an endpoint family fails fast.
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 30.0  # seconds until a half-open probe is let through
 
 _PUNCT_CLEANER = re.compile(r"[^\w\s-]+")
+# Distinct names/ids whose lookup-key variants are remembered across refreshes.
+KEY_CACHE_SIZE = 32768
 
 POE_CURRENCY_OVERVIEW_TYPES: List[str] = [
     "Currency",
@@ -111,6 +153,458 @@ POE2_FALLBACK_OVERVIEWS: List[str] = [
 class ApiError(RuntimeError):
     """Raised when the PoE Ninja API request fails."""
 
+    def __init__(self, message: str, status: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+# Shared by every fetch helper so refreshes reuse TCP/TLS sessions to poe.ninja.
+_HTTP_POOL = ConnectionPool()
+
+
+class _RequestScheduler:
+    """Token bucket that paces every request and pauses everyone after a 429."""
+
+    def __init__(self, rate: float = DEFAULT_REQUEST_RATE, burst: int = DEFAULT_REQUEST_BURST) -> None:
+        self._lock = threading.Lock()
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._stats: Dict[str, int] = {
+            "throttle_waits": 0,
+            "throttle_wait_ms": 0,
+            "rate_limit_retries": 0,
+        }
+
+    def configure(self, rate: float, burst: int) -> None:
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.burst = max(burst, 1)
+            self._tokens = min(self._tokens, float(self.burst))
+
+    def acquire(self) -> None:
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                paused = self._paused_until - now
+                if paused <= 0 and (self.rate <= 0 or self._tokens >= 1.0):
+                    if self.rate > 0:
+                        self._tokens -= 1.0
+                    if waited:
+                        self._stats["throttle_waits"] += 1
+                        self._stats["throttle_wait_ms"] += int(waited * 1000)
+                    return
+                delay = max(paused, (1.0 - self._tokens) / self.rate if self.rate > 0 else 0.0)
+            time.sleep(delay)
+            waited += delay
+
+    def defer(self, error: HTTPStatusError, attempt: int) -> None:
+        """Pause all requests after a rate-limit answer (Retry-After or backoff with jitter)."""
+        delay = _parse_retry_after(error.headers.get("retry-after"))
+        if delay is None:
+            backoff = RATE_LIMIT_BACKOFF * (2 ** attempt)
+            delay = backoff / 2 + random.uniform(0, backoff / 2)
+        delay = min(delay, MAX_RETRY_AFTER)
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._tokens = 0.0
+            self._stats["rate_limit_retries"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _refill(self, now: float) -> None:
+        if self.rate > 0:
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+_SCHEDULER = _RequestScheduler()
+
+
+def configure_rate_limit(rate: float, burst: int) -> None:
+    """Set the process-wide request rate (requests/second, 0 disables pacing) and burst size."""
+    _SCHEDULER.configure(rate, burst)
+
+
+class _DetailMemo:
+    """Last exchange detail per item, tagged with the fingerprint of the overview line it was fetched for."""
+
+    def __init__(self, ttl: float = DEFAULT_DETAIL_TTL, max_entries: int = MAX_REMEMBERED_DETAILS) -> None:
+        self.ttl = max(ttl, 0.0)
+        self.max_entries = max(max_entries, 1)
+        self._entries: "OrderedDict[str, Tuple[Optional[str], float, Optional[dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {"details_reused": 0, "details_fetched": 0, "details_failed": 0}
+
+    def lookup(
+        self, league: str, category: str, item_id: str, fingerprint: Optional[str]
+    ) -> Tuple[Optional[bool], Optional[dict]]:
+        """``(True, detail)`` when reusable, ``(False, None)`` when stale, ``(None, None)`` when unknown."""
+        key = f"{league}|{category}|{item_id}"
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None:
+                return None, None
+            previous_fingerprint, fetched_at, detail = cached
+            if (
+                fingerprint is None
+                or previous_fingerprint != fingerprint
+                or time.time() - fetched_at >= self.ttl
+            ):
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["details_reused"] += 1
+            return True, detail
+
+    def remember(
+        self, league: str, category: str, item_id: str, fingerprint: Optional[str], detail: Optional[dict]
+    ) -> None:
+        key = f"{league}|{category}|{item_id}"
+        with self._lock:
+            if detail is None:
+                # A failed or empty fetch is retried on the next refresh, not reused for the TTL.
+                self._stats["details_failed"] += 1
+                return
+            self._stats["details_fetched"] += 1
+            self._entries[key] = (fingerprint, time.time(), detail)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+_DETAIL_MEMO = _DetailMemo()
+
+
+def configure_detail_ttl(ttl: float) -> None:
+    """Seconds an exchange detail is reused while its overview line stays unchanged (0 always refetches)."""
+    _DETAIL_MEMO.ttl = max(ttl, 0.0)
+
+
+class _DetailContext:
+    """What applying an exchange detail to an entry needs from the overview it belongs to."""
+
+    __slots__ = ("chaos_per_primary", "divine_rate_from_core", "divine_rate", "icon_lookup", "name_lookup", "fingerprints")
+
+    def __init__(
+        self,
+        chaos_per_primary: Optional[float],
+        divine_rate_from_core: Optional[float],
+        icon_lookup: Dict[str, str],
+        name_lookup: Dict[str, str],
+        fingerprints: Dict[str, str],
+    ) -> None:
+        self.chaos_per_primary = chaos_per_primary
+        self.divine_rate_from_core = divine_rate_from_core
+        self.divine_rate: Optional[float] = None
+        self.icon_lookup = icon_lookup
+        self.name_lookup = name_lookup
+        self.fingerprints = fingerprints
+
+
+# Detail context of the latest lazily built PoE2 snapshot per (league, category).
+_DETAIL_CONTEXTS: Dict[Tuple[str, str], _DetailContext] = {}
+_DETAIL_CONTEXTS_LOCK = threading.Lock()
+
+
+def _detail_context_key(league: str, category: str) -> Tuple[str, str]:
+    return (league.strip().lower(), category.strip().lower())
+
+
+# ETag/Last-Modified validators (and bodies) of previously downloaded URLs.
+_VALIDATORS = ConditionalCache()
+MAX_REUSABLE_SNAPSHOTS = 64
+# How long raw responses are served from the disk cache before going back to the network.
+RESPONSE_TTL_OVERVIEW = 60.0
+RESPONSE_TTL_DETAILS = 900.0
+
+
+class _RevalidationLog:
+    """Records the responses a snapshot is built from: URL, whether it was a 304, and a body digest."""
+
+    __slots__ = ("responses",)
+
+    def __init__(self) -> None:
+        self.responses: List[Tuple[str, bool, str]] = []
+
+    def record(self, url: str, not_modified: bool, body: bytes) -> None:
+        self.responses.append((url, not_modified, hashlib.blake2b(body, digest_size=16).hexdigest()))
+
+    def merge(self, other: "_RevalidationLog") -> None:
+        self.responses.extend(other.responses)
+
+    def signature(self) -> Tuple[Tuple[str, str], ...]:
+        # Another fetch key may have revalidated a shared URL since, so a 304 alone does not
+        # prove the memoised snapshot was built from the body that is current now.
+        return tuple(sorted((url, digest) for url, _, digest in self.responses))
+
+    def unchanged(self) -> bool:
+        return bool(self.responses) and all(not_modified for _, not_modified, _ in self.responses)
+
+
+class _SnapshotMemo:
+    """Last snapshot built per fetch key, reused when every source answered 304."""
+
+    def __init__(self, max_entries: int = MAX_REUSABLE_SNAPSHOTS) -> None:
+        self.max_entries = max(max_entries, 1)
+        self._entries: "OrderedDict[str, Tuple[Tuple[Tuple[str, str], ...], CurrencySnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.reused = 0
+
+    def reuse(self, key: str, log: _RevalidationLog) -> Optional[CurrencySnapshot]:
+        if not log.unchanged():
+            return None
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is None or cached[0] != log.signature():
+                return None
+            self._entries.move_to_end(key)
+            self.reused += 1
+        previous = cached[1]
+        return CurrencySnapshot(
+            league=previous.league,
+            entries=list(previous.entries),
+            fetched_at=time.time(),
+            source_type=previous.source_type,
+        )
+
+    def remember(self, key: str, log: _RevalidationLog, snapshot: CurrencySnapshot) -> None:
+        if not log.responses:
+            return
+        with self._lock:
+            self._entries[key] = (log.signature(), snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_SNAPSHOT_MEMO = _SnapshotMemo()
+# Concurrent fetches of the same URL (and cookie) share one request and one parse.
+_IN_FLIGHT = SingleFlight()
+
+_RESOLUTION: Optional[ResolutionMemo] = None
+_RESOLUTION_LOCK = threading.Lock()
+_T = TypeVar("_T")
+
+
+def _resolution() -> ResolutionMemo:
+    global _RESOLUTION
+    with _RESOLUTION_LOCK:
+        if _RESOLUTION is None:
+            _RESOLUTION = ResolutionMemo()
+        return _RESOLUTION
+
+
+_RESPONSES: Optional[ResponseCache] = None
+_RESPONSES_LOCK = threading.Lock()
+
+
+def _responses() -> ResponseCache:
+    global _RESPONSES
+    with _RESPONSES_LOCK:
+        if _RESPONSES is None:
+            _RESPONSES = ResponseCache()
+        return _RESPONSES
+
+
+_RECORDER: Optional[TrafficRecorder] = None
+_REPLAYER: Optional[TrafficReplayer] = None
+
+
+def configure_traffic(
+    record_path: Optional[str] = None,
+    replay_path: Optional[str] = None,
+    replay_latency: float = 0.0,
+) -> None:
+    """Record every live response to an archive, or answer every request from one.
+
+    A replay keeps endpoint resolution in memory and stores no responses, so
+    it neither reads nor changes what live runs left under ``.cache``.
+    """
+    global _RECORDER, _REPLAYER, _RESOLUTION, _RESPONSES
+    close_traffic()
+    if replay_path:
+        _REPLAYER = TrafficReplayer(replay_path, latency=replay_latency)
+        with _RESOLUTION_LOCK:
+            _RESOLUTION = ResolutionMemo(path=None)
+        with _RESPONSES_LOCK:
+            _RESPONSES = ResponseCache(directory=None)
+    elif record_path:
+        _RECORDER = TrafficRecorder(record_path)
+
+
+def close_traffic() -> None:
+    global _RECORDER, _REPLAYER, _RESOLUTION, _RESPONSES
+    if _RECORDER is not None:
+        _RECORDER.close()
+    if _REPLAYER is not None:
+        # Drop the replay's in-memory stores; live requests load the persisted ones again.
+        with _RESOLUTION_LOCK:
+            _RESOLUTION = None
+        with _RESPONSES_LOCK:
+            _RESPONSES = None
+    _RECORDER = None
+    _REPLAYER = None
+
+
+def _replay(url: str, log: Optional[_RevalidationLog]) -> HttpResponse:
+    try:
+        response = _REPLAYER.response(url)
+    except ReplayError as exc:
+        raise ApiError(str(exc)) from exc
+    if response.status >= 400:
+        raise ApiError(f"HTTP Error {response.status}: {response.reason}", status=response.status)
+    if log is not None:
+        log.record(url, False, response.body)
+    return response
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {
+    name: CircuitBreaker(name, BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT)
+    for name in ("PoE data", "PoE2 exchange", "PoE2 details", "PoE2 temp", "PoE2 overview")
+}
+
+
+def _endpoint_breaker(url: str) -> CircuitBreaker:
+    path = urllib.parse.urlsplit(url).path
+    if "/poe2/" not in path:
+        return _BREAKERS["PoE data"]
+    if path.endswith("/details"):
+        return _BREAKERS["PoE2 details"]
+    if path.endswith("/temp/overview"):
+        return _BREAKERS["PoE2 temp"]
+    if "exchange/" in path:
+        return _BREAKERS["PoE2 exchange"]
+    return _BREAKERS["PoE2 overview"]
+
+
+def circuit_states() -> Dict[str, Tuple[str, float]]:
+    """State of each endpoint family's circuit breaker and seconds until its next probe."""
+    return {name: breaker.state() for name, breaker in _BREAKERS.items()}
+
+
+_CURRENT_ORIGIN = NINJA_ORIGIN
+
+
+def set_base_url(origin: str) -> None:
+    """Send every request to ``origin`` (scheme://host[:port]) instead of poe.ninja.
+
+    Used to point the tracker at a local stand-in server; the endpoint paths stay the same.
+    """
+    global POE_API_BASE_URL, POE2_API_BASE_URL, POE2_TEMP_OVERVIEW_URL, _CURRENT_ORIGIN
+    target = origin.strip().rstrip("/") or NINJA_ORIGIN
+    previous = _CURRENT_ORIGIN
+
+    def _rebase(url: str) -> str:
+        return target + url[len(previous):] if url.startswith(previous) else url
+
+    POE_API_BASE_URL = _rebase(POE_API_BASE_URL)
+    POE2_API_BASE_URL = _rebase(POE2_API_BASE_URL)
+    POE2_TEMP_OVERVIEW_URL = _rebase(POE2_TEMP_OVERVIEW_URL)
+    # Rebuilt in place: the fetch helpers read these lists at call time.
+    POE2_EXCHANGE_OVERVIEW_ENDPOINTS[:] = [(_rebase(url), *keys) for url, *keys in POE2_EXCHANGE_OVERVIEW_ENDPOINTS]
+    POE2_EXCHANGE_DETAILS_ENDPOINTS[:] = [(_rebase(url), *keys) for url, *keys in POE2_EXCHANGE_DETAILS_ENDPOINTS]
+    _CURRENT_ORIGIN = target
+
+
+def _response_ttl(url: str) -> float:
+    # Per-item exchange history changes slowly compared to the overview prices.
+    path = urllib.parse.urlsplit(url).path
+    if path.endswith("/details"):
+        return RESPONSE_TTL_DETAILS
+    return RESPONSE_TTL_OVERVIEW
+
+
+class _StageTimer:
+    """Wall-clock time spent per stage of a snapshot fetch, in seconds."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def timed(self, name: str, func: Callable[..., _T], *args: Any) -> _T:
+        with self.stage(name):
+            return func(*args)
+
+    def finish(self) -> Dict[str, float]:
+        with self._lock:
+            timings = dict(self.stages)
+        timings["total"] = time.perf_counter() - self._started
+        return timings
+
+
+_LAST_TIMINGS: Dict[str, float] = {}
+
+
+def last_fetch_timings() -> Dict[str, float]:
+    """Per-stage timing breakdown (seconds) of the most recent PoE2 snapshot fetch."""
+    return dict(_LAST_TIMINGS)
+
+
+def _preferred_first(candidates: Iterable[_T], preferred: Optional[str], name: Callable[[_T], str]) -> List[_T]:
+    ordered = list(candidates)
+    if preferred is None:
+        return ordered
+    return sorted(ordered, key=lambda candidate: name(candidate) != preferred)
+
+
+def fetch_stats() -> Dict[str, int]:
+    """Return counters describing the HTTP fetch layer (connection reuse, 304 hits, ...)."""
+    stats = _HTTP_POOL.stats()
+    stats.update(_VALIDATORS.stats())
+    stats.update(_SCHEDULER.stats())
+    stats["snapshots_reused"] = _SNAPSHOT_MEMO.reused
+    stats.update(_IN_FLIGHT.stats())
+    stats.update(_resolution().stats)
+    stats.update(_responses().stats())
+    stats.update(_DETAIL_MEMO.stats())
+    key_cache = _key_variants.cache_info()
+    stats["key_cache_hits"] = key_cache.hits
+    stats["key_cache_misses"] = key_cache.misses
+    stats["key_cache_size"] = key_cache.currsize
+    for breaker in _BREAKERS.values():
+        for name, value in breaker.stats().items():
+            stats[f"circuit_{name}"] = stats.get(f"circuit_{name}", 0) + value
+    return stats
+
 
 def _make_request(
     url: str,
@@ -118,6 +612,17 @@ def _make_request(
     headers: Optional[Dict[str, str]] = None,
     ninja_cookie: Optional[str] = None,
 ) -> bytes:
+    return _request(url, timeout, headers, ninja_cookie).body
+
+
+def _request(
+    url: str,
+    timeout: int,
+    headers: Optional[Dict[str, str]] = None,
+    ninja_cookie: Optional[str] = None,
+    log: Optional[_RevalidationLog] = None,
+    use_cache: bool = True,
+) -> HttpResponse:
     request_headers = {
         "User-Agent": USER_AGENT,
         "Accept": "application/json",
@@ -127,16 +632,153 @@ def _make_request(
     cookie_header = _format_cookie(ninja_cookie)
     if cookie_header:
         request_headers.setdefault("Cookie", cookie_header)
-    request = urllib.request.Request(
-        url,
-        headers=request_headers,
-        method="GET",
-    )
+    if _REPLAYER is not None:
+        return _replay(url, log)
+    validator_key = f"{url}|{cookie_header or ''}"
+    responses = _responses()
+    # While recording every request goes to the network so the archive is complete.
+    cached_body = responses.get(validator_key) if use_cache and _RECORDER is None else None
+    if cached_body is not None:
+        # Same body as the last network answer, so it counts as unchanged for snapshot reuse.
+        resolved = HttpResponse(
+            url=url, status=304, reason="Cached", headers={"content-type": "application/json"}, body=cached_body
+        )
+        if log is not None:
+            log.record(url, True, cached_body)
+        return resolved
+    conditional = _VALIDATORS.conditional_headers(validator_key)
+    breaker = _endpoint_breaker(url)
+    started = time.perf_counter()
     try:
-        with urllib.request.urlopen(request, timeout=timeout) as response:
-            return response.read()
-    except urllib.error.URLError as exc:
-        raise ApiError(str(exc)) from exc
+        breaker.check()
+        response = _send_scheduled(url, {**request_headers, **conditional}, timeout)
+        resolved = _VALIDATORS.resolve(validator_key, response)
+        if resolved is None:
+            response = _send_scheduled(url, request_headers, timeout)
+            resolved = _VALIDATORS.resolve(validator_key, response)
+    except TransportError as exc:
+        if not isinstance(exc, CircuitOpenError):
+            # A 4xx (e.g. 404 for a missing variant) still proves the endpoint is answering.
+            status = getattr(exc, "status", None)
+            if status is None or status >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        if _RECORDER is not None and isinstance(exc, HTTPStatusError):
+            _RECORDER.record(
+                url, request_headers, exc.status, exc.reason, exc.headers, b"", time.perf_counter() - started
+            )
+        raise ApiError(str(exc), status=getattr(exc, "status", None)) from exc
+    except BaseException:
+        # Any other error (a bug, MemoryError, an interrupt) must still settle a half-open probe,
+        # or the breaker would reject this endpoint family for the rest of the process.
+        breaker.record_failure()
+        raise
+    breaker.record_success()
+    if resolved is None:
+        raise ApiError(f"Unexpected 304 response for {url}")
+    if _RECORDER is not None:
+        # Revalidated bodies are archived as plain 200s so a replay never depends on validator state.
+        _RECORDER.record(
+            url,
+            request_headers,
+            200 if resolved.status == 304 else resolved.status,
+            resolved.reason,
+            resolved.headers,
+            resolved.body,
+            time.perf_counter() - started,
+        )
+    if resolved.body:
+        responses.put(validator_key, resolved.body, _response_ttl(url))
+    if log is not None:
+        log.record(url, resolved.status == 304, resolved.body)
+    return resolved
+
+
+def _flight_key(
+    kind: str,
+    url: str,
+    ninja_cookie: Optional[str],
+    use_cache: bool = True,
+    headers: Optional[Dict[str, str]] = None,
+) -> str:
+    # Only identical requests share a flight: a caller that skips the response cache must not
+    # join one that may be answered from it, and different headers may get different answers.
+    fresh = "" if use_cache else "|fresh"
+    extra = "".join(f"|{name.lower()}={value}" for name, value in sorted((headers or {}).items()))
+    return f"{kind}|{normalize_url(url)}|{_format_cookie(ninja_cookie) or ''}{fresh}{extra}"
+
+
+# Every key the parsers below read from a line, item or detail record. Anything else inside
+# those records (modifiers, trade info, flavour text, ...) is dropped while decoding.
+_PROJECTED_FIELDS = frozenset(
+    {
+        "change", "chaos", "chaosEquivalent", "chaosPerItem", "chaosValue", "core", "count",
+        "currency", "currencyData", "currencyDetails", "currencyDetailsId", "currencyDetailsMap",
+        "currencyId", "currencyName", "currencyTypeId", "currencyTypeName", "data", "detailId",
+        "details", "detailsId", "displayName", "divine", "entries", "history", "icon", "id", "image",
+        "item", "itemId", "itemName", "items", "line", "lineItems", "lines", "listing", "listingCount",
+        "name", "pay", "payCurrency", "payCurrencyDetailsId", "payCurrencyId", "payCurrencyName",
+        "payCurrencyTypeName", "paySparkLine", "payload", "primary", "primaryValue", "rate", "rates",
+        "receive", "receiveCurrency", "receiveCurrencyDetailsId", "receiveCurrencyId",
+        "receiveCurrencyName", "receiveCurrencyTypeName", "receiveListing", "receiveSparkLine",
+        "result", "results", "secondary", "secondaryValue", "sparkLine", "sparkline", "targetCurrency",
+        "targetCurrencyId", "total", "totalChange", "totalVolume", "typeName", "value", "valueChaos",
+        "values", "volume", "volumePrimaryValue", "volumeSecondaryValue",
+    }
+)
+# Arrays whose elements are records, at the top level of a document or inside "payload".
+_RECORD_ARRAYS = ("lines", "items", "entries", "lineItems", "result", "results", "data", "history")
+_PROJECTOR = FieldProjector(_PROJECTED_FIELDS, _RECORD_ARRAYS, wrapper_keys=("payload",))
+_PROJECTED_DECODING = True
+
+
+def configure_decoding(projected: bool) -> None:
+    """Choose between projected decoding (only the fields the parsers read) and plain ``json.loads``."""
+    global _PROJECTED_DECODING
+    _PROJECTED_DECODING = bool(projected)
+
+
+def _decode_json(body: bytes) -> object:
+    # Projection needs the standard library decoder's hooks; a faster backend, when
+    # installed, decodes whole documents quicker than the projected path.
+    if _PROJECTED_DECODING and codec.BACKEND == codec.STDLIB:
+        return _PROJECTOR.loads(body)
+    return codec.loads(body)
+
+
+def _request_json(
+    url: str,
+    timeout: int,
+    headers: Optional[Dict[str, str]] = None,
+    ninja_cookie: Optional[str] = None,
+    log: Optional[_RevalidationLog] = None,
+    use_cache: bool = True,
+) -> object:
+    """Fetch and decode a JSON document; raises ApiError or json.JSONDecodeError."""
+
+    def _load() -> Tuple[object, _RevalidationLog]:
+        local_log = _RevalidationLog()
+        response = _request(url, timeout, headers, ninja_cookie, local_log, use_cache=use_cache)
+        return _decode_json(response.body), local_log
+
+    data, local_log = _IN_FLIGHT.do(_flight_key("json", url, ninja_cookie, use_cache, headers), _load)
+    if log is not None:
+        log.merge(local_log)
+    return data
+
+
+def _send_scheduled(url: str, headers: Dict[str, str], timeout: int) -> HttpResponse:
+    attempt = 0
+    while True:
+        _SCHEDULER.acquire()
+        try:
+            return _HTTP_POOL.request(url, headers, timeout)
+        except HTTPStatusError as exc:
+            if exc.status not in _RETRYABLE_STATUSES or attempt >= RATE_LIMIT_RETRIES:
+                raise
+            _SCHEDULER.defer(exc, attempt)
+            attempt += 1
 
 
 def _extract_float(value: object) -> Optional[float]:
@@ -181,13 +823,17 @@ def _collect_keys(*values: object) -> List[str]:
             continue
         if not isinstance(value, str):
             continue
-        variants = {_norm_key(value), _slug_key(value), _nopunct_key(value)}
-        for variant in variants:
-            if variant:
-                keys.append(variant)
+        keys.extend(_key_variants(value))
     return keys
 
 
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _key_variants(value: str) -> Tuple[str, ...]:
+    # Interned so every refresh reuses the same key objects in its lookup dicts.
+    variants = {_norm_key(value), _slug_key(value), _nopunct_key(value)}
+    return tuple(sys.intern(variant) for variant in variants if variant)
+
+
 def _normalize_divine_rate(divine_rate: Optional[float]) -> Optional[float]:
     if divine_rate is None:
         return None
@@ -409,20 +1055,57 @@ def fetch_currency_snapshot(
     timeout: int = DEFAULT_TIMEOUT,
     ninja_cookie: Optional[str] = None,
     price_mode: str = "stash",
+    detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+    lazy_details: bool = False,
+    use_cache: bool = True,
+) -> CurrencySnapshot:
+    """Fetch and parse the currency overview for the specified league.
+
+    With ``lazy_details`` PoE2 exchange details are not downloaded up front; only
+    details already remembered are applied, and the rest can be loaded per entry
+    with :func:`fetch_exchange_detail` and :func:`apply_exchange_detail`. With
+    ``use_cache=False`` overviews are requested from poe.ninja even when the
+    response cache still holds them (a manual refresh).
+    """
+    try:
+        return _fetch_snapshot_for_game(
+            league, category, game, timeout, ninja_cookie, price_mode, detail_concurrency, lazy_details, use_cache
+        )
+    finally:
+        _responses().flush()
+
+
+def _fetch_snapshot_for_game(
+    league: str,
+    category: str,
+    game: str,
+    timeout: int,
+    ninja_cookie: Optional[str],
+    price_mode: str,
+    detail_concurrency: int,
+    lazy_details: bool = False,
+    use_cache: bool = True,
 ) -> CurrencySnapshot:
-    """Fetch and parse the currency overview for the specified league."""
     normalized_game = (game or "poe2").lower()
     normalized_category = (category or "").strip()
     normalized_mode = (price_mode or "stash").strip().lower()
     if normalized_game == "poe2":
-        return _fetch_poe2_snapshot(league, normalized_category or "Currency", timeout, ninja_cookie)
+        return _fetch_poe2_snapshot(
+            league,
+            normalized_category or "Currency",
+            timeout,
+            ninja_cookie,
+            detail_concurrency,
+            lazy_details,
+            use_cache,
+        )
     if normalized_game == "poe":
         if normalized_mode == "exchange" and _is_poe_currency_category(normalized_category):
-            return _fetch_poe_exchange_snapshot(league, normalized_category, timeout, ninja_cookie)
+            return _fetch_poe_exchange_snapshot(league, normalized_category, timeout, ninja_cookie, use_cache)
         if _is_poe_item_category(normalized_category):
-            return _fetch_poe_item_snapshot(league, normalized_category, timeout, ninja_cookie)
-        return _fetch_poe_snapshot(league, normalized_category or "Currency", timeout, ninja_cookie)
-    return _fetch_poe_snapshot(league, normalized_category or "Currency", timeout, ninja_cookie)
+            return _fetch_poe_item_snapshot(league, normalized_category, timeout, ninja_cookie, use_cache)
+        return _fetch_poe_snapshot(league, normalized_category or "Currency", timeout, ninja_cookie, use_cache=use_cache)
+    return _fetch_poe_snapshot(league, normalized_category or "Currency", timeout, ninja_cookie, use_cache=use_cache)
 
 
 def _merge_entry_attributes(target: CurrencyEntry, source: CurrencyEntry) -> None:
@@ -440,28 +1123,130 @@ def _merge_entry_attributes(target: CurrencyEntry, source: CurrencyEntry) -> Non
         target.icon_url = source.icon_url
 
 
-def _deduplicate_entries(entries: List[CurrencyEntry]) -> List[CurrencyEntry]:
-    key_to_entry: Dict[str, CurrencyEntry] = {}
-    ordered: List[CurrencyEntry] = []
+def _entry_key_values(entry: CurrencyEntry) -> Tuple[object, ...]:
+    return (entry.details_id, entry.name)
+
+
+class _EntryIndex:
+    """The rows of one snapshot, findable by every key variant of their ids, slugs and names.
+
+    Rows are entries unless ``key_values`` says otherwise. A key resolves to
+    the earliest-added row holding it, the same row a first-wins dict built
+    over the rows in order would give, so every merge stage can share one
+    index instead of rebuilding its own. Call :meth:`rekey` after changing
+    the values a row is keyed by.
+    """
+
+    __slots__ = ("rows", "_key_values", "_holders", "_keys", "_positions", "_added")
+
+    def __init__(
+        self,
+        rows: Iterable[Any] = (),
+        key_values: Callable[[Any], Tuple[object, ...]] = _entry_key_values,
+    ) -> None:
+        self.rows: List[Any] = []
+        self._key_values = key_values
+        # Rows holding each key, earliest first. Rows are tracked by identity:
+        # entries compare equal field by field.
+        self._holders: Dict[str, List[Any]] = {}
+        self._keys: Dict[int, Tuple[str, ...]] = {}
+        self._positions: Dict[int, int] = {}
+        self._added = 0
+        for row in rows:
+            self.add(row)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._holders
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _collect(self, row: Any) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(_collect_keys(*self._key_values(row))))
+
+    def keys_of(self, row: Any) -> Tuple[str, ...]:
+        return self._keys[id(row)]
+
+    def get(self, key: str) -> Optional[Any]:
+        holders = self._holders.get(key)
+        return holders[0] if holders else None
+
+    def find(self, *values: object) -> Optional[Any]:
+        """The row holding the first key of ``values`` that any row holds."""
+        for key in _collect_keys(*values):
+            holders = self._holders.get(key)
+            if holders:
+                return holders[0]
+        return None
 
-    for entry in entries:
-        keys = _collect_keys(entry.details_id, entry.name)
-        primary_key = keys[0] if keys else entry.name.strip().lower()
-        owner = None
+    def add(self, row: Any) -> None:
+        self._positions[id(row)] = self._added
+        self._added += 1
+        self.rows.append(row)
+        keys = self._collect(row)
+        self._keys[id(row)] = keys
+        for key in keys:
+            self._holders.setdefault(key, []).append(row)
+
+    def rekey(self, row: Any) -> None:
+        previous = self._keys[id(row)]
+        keys = self._collect(row)
+        if keys == previous:
+            return
+        self._keys[id(row)] = keys
+        for key in previous:
+            if key not in keys:
+                self._release(key, row)
         for key in keys:
-            owner = key_to_entry.get(key)
-            if owner:
+            if key not in previous:
+                self._hold(key, row)
+
+    def _hold(self, key: str, row: Any) -> None:
+        holders = self._holders.setdefault(key, [])
+        position = self._positions[id(row)]
+        index = len(holders)
+        while index and self._positions[id(holders[index - 1])] > position:
+            index -= 1
+        holders.insert(index, row)
+
+    def _release(self, key: str, row: Any) -> None:
+        holders = self._holders[key]
+        for index, holder in enumerate(holders):
+            if holder is row:
+                del holders[index]
                 break
-        if owner is None:
-            owner = entry
-            ordered.append(owner)
-        else:
-            _merge_entry_attributes(owner, entry)
-        for key in keys or [primary_key]:
-            if key:
-                key_to_entry.setdefault(key, owner)
+        if not holders:
+            del self._holders[key]
+
+    def deduplicate(self) -> List[CurrencyEntry]:
+        """Merge each entry into the earliest one it shares a key with; returns and keeps the survivors."""
+        owners: Dict[int, CurrencyEntry] = {}
+        survivors: List[CurrencyEntry] = []
+        merged: List[CurrencyEntry] = []
+        for entry in self.rows:
+            owner = None
+            for key in self._keys[id(entry)]:
+                first = self._holders[key][0]
+                if first is not entry:
+                    owner = owners[id(first)]
+                    break
+            if owner is None:
+                owner = entry
+                survivors.append(entry)
+            else:
+                _merge_entry_attributes(owner, entry)
+                merged.append(entry)
+            owners[id(entry)] = owner
+        for entry in merged:
+            for key in self._keys.pop(id(entry)):
+                self._release(key, entry)
+            del self._positions[id(entry)]
+        self.rows = survivors
+        return survivors
+
 
-    return ordered
+def _deduplicate_entries(entries: List[CurrencyEntry]) -> List[CurrencyEntry]:
+    return _EntryIndex(entries).deduplicate()
 
 
 def _apply_exalted_values(entries: List[CurrencyEntry]) -> None:
@@ -493,16 +1278,54 @@ def _fetch_poe_snapshot(
     category: str,
     timeout: int,
     ninja_cookie: Optional[str] = None,
+    log: Optional[_RevalidationLog] = None,
+    use_cache: bool = True,
 ) -> CurrencySnapshot:
     query = urllib.parse.urlencode({"league": league, "type": category})
     url = f"{POE_API_BASE_URL}/currencyoverview?{query}"
-    payload = _make_request(url, timeout, ninja_cookie=ninja_cookie)
-    data = json.loads(payload)
-    snapshot = _parse_snapshot_payload(data, league, category, "currencyoverview")
-    if snapshot is None:
-        raise ApiError("PoE currency overview response missing expected data.")
-    _apply_exalted_values(snapshot.entries)
-    return snapshot
+    return _fetch_overview_snapshot(url, league, category, "currencyoverview", timeout, ninja_cookie, log, use_cache)
+
+
+def _fetch_overview_snapshot(
+    url: str,
+    league: str,
+    category: str,
+    source: str,
+    timeout: int,
+    ninja_cookie: Optional[str],
+    log: Optional[_RevalidationLog] = None,
+    use_cache: bool = True,
+) -> CurrencySnapshot:
+    def _load() -> Tuple[CurrencySnapshot, _RevalidationLog]:
+        local_log = _RevalidationLog()
+        response = _request(url, timeout, ninja_cookie=ninja_cookie, log=local_log, use_cache=use_cache)
+        reused = _SNAPSHOT_MEMO.reuse(url, local_log)
+        if reused is not None:
+            return reused, local_log
+        snapshot = None
+        if source == "itemoverview":
+            # Item overviews run to tens of thousands of lines; convert them while decoding.
+            snapshot = _parse_snapshot_stream(response.body, league, category, source)
+        if snapshot is None:
+            snapshot = _parse_snapshot_payload(_decode_json(response.body), league, category, source)
+        if snapshot is None:
+            kind = "currency" if source == "currencyoverview" else "item"
+            raise ApiError(f"PoE {kind} overview response missing expected data.")
+        _apply_exalted_values(snapshot.entries)
+        _SNAPSHOT_MEMO.remember(url, local_log, snapshot)
+        return snapshot, local_log
+
+    # Stash and exchange refreshes both need the PoE1 currencyoverview; share the parse.
+    snapshot, local_log = _IN_FLIGHT.do(_flight_key("snapshot", url, ninja_cookie, use_cache), _load)
+    if log is not None:
+        log.merge(local_log)
+    # Each caller gets its own container so companions and list edits stay private.
+    return CurrencySnapshot(
+        league=snapshot.league,
+        entries=list(snapshot.entries),
+        fetched_at=snapshot.fetched_at,
+        source_type=snapshot.source_type,
+    )
 
 
 def _fetch_poe_exchange_snapshot(
@@ -510,11 +1333,26 @@ def _fetch_poe_exchange_snapshot(
     category: str,
     timeout: int,
     ninja_cookie: Optional[str] = None,
+    use_cache: bool = True,
 ) -> CurrencySnapshot:
     query = urllib.parse.urlencode({"league": league, "type": category})
     url = f"{POE_API_BASE_URL.replace('/api/data', '/poe1/api/economy')}/exchange/current/overview?{query}"
-    payload = _make_request(url, timeout, ninja_cookie=ninja_cookie)
-    data = json.loads(payload)
+    log = _RevalidationLog()
+    # The stash overview only back-fills sparklines and trade counts, so both downloads
+    # can run at the same time.
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="poe-exchange") as executor:
+        stash_future = executor.submit(
+            _fetch_poe_stash_companion, league, category, timeout, ninja_cookie, log, use_cache
+        )
+        response = _request(url, timeout, ninja_cookie=ninja_cookie, log=log, use_cache=use_cache)
+        stash_snapshot = stash_future.result()
+    memo_key = f"poe-exchange|{url}"
+    reused = _SNAPSHOT_MEMO.reuse(memo_key, log)
+    if reused is not None:
+        if stash_snapshot is not None:
+            reused.companions["stash"] = stash_snapshot
+        return reused
+    data = _decode_json(response.body)
     working = data.get("payload") if isinstance(data, dict) else None
     if isinstance(working, dict) and working:
         exchange_source = working
@@ -527,57 +1365,60 @@ def _fetch_poe_exchange_snapshot(
         raise ApiError(f"No exchange data returned for category '{category}' in league '{league}'.")
     entries = _parse_currency_lines(rows, divine_rate, icon_lookup, name_lookup)
     entries = _deduplicate_entries(entries)
-    try:
-        stash_snapshot = _fetch_poe_snapshot(league, category, timeout, ninja_cookie)
-    except ApiError:
-        stash_snapshot = None
     if stash_snapshot and stash_snapshot.entries:
-        stash_lookup: Dict[str, CurrencyEntry] = {}
-        for stash_entry in stash_snapshot.entries:
-            for key in _collect_keys(stash_entry.details_id, stash_entry.name):
-                if key:
-                    stash_lookup.setdefault(key, stash_entry)
+        stash_index = _EntryIndex(stash_snapshot.entries)
         for entry in entries:
             if entry.sparkline and entry.trade_count and entry.change_percent is not None:
                 continue
-            for key in _collect_keys(entry.details_id, entry.name):
-                stash_match = stash_lookup.get(key)
-                if not stash_match:
-                    continue
-                if not entry.sparkline and stash_match.sparkline:
-                    entry.sparkline = stash_match.sparkline
-                if entry.trade_count is None and stash_match.trade_count:
-                    entry.trade_count = stash_match.trade_count
-                if entry.change_percent is None and stash_match.change_percent is not None:
-                    entry.change_percent = stash_match.change_percent
-                break
+            stash_match = stash_index.find(entry.details_id, entry.name)
+            if stash_match is None:
+                continue
+            if not entry.sparkline and stash_match.sparkline:
+                entry.sparkline = stash_match.sparkline
+            if entry.trade_count is None and stash_match.trade_count:
+                entry.trade_count = stash_match.trade_count
+            if entry.change_percent is None and stash_match.change_percent is not None:
+                entry.change_percent = stash_match.change_percent
     if divine_rate and divine_rate > 0:
         for entry in entries:
             entry.divine_value = entry.chaos_value / divine_rate if entry.chaos_value else None
     entries.sort(key=lambda item: item.chaos_value, reverse=True)
     _apply_exalted_values(entries)
-    return CurrencySnapshot(
+    snapshot = CurrencySnapshot(
         league=league,
         entries=entries,
         fetched_at=time.time(),
         source_type=f"{category}:poe-exchange",
     )
+    _SNAPSHOT_MEMO.remember(memo_key, log, snapshot)
+    if stash_snapshot is not None:
+        snapshot.companions["stash"] = stash_snapshot
+    return snapshot
+
+
+def _fetch_poe_stash_companion(
+    league: str,
+    category: str,
+    timeout: int,
+    ninja_cookie: Optional[str],
+    log: _RevalidationLog,
+    use_cache: bool = True,
+) -> Optional[CurrencySnapshot]:
+    try:
+        return _fetch_poe_snapshot(league, category, timeout, ninja_cookie, log, use_cache)
+    except ApiError:
+        return None
 
 def _fetch_poe_item_snapshot(
     league: str,
     category: str,
     timeout: int,
     ninja_cookie: Optional[str] = None,
+    use_cache: bool = True,
 ) -> CurrencySnapshot:
     query = urllib.parse.urlencode({"league": league, "type": category})
     url = f"{POE_API_BASE_URL}/itemoverview?{query}"
-    payload = _make_request(url, timeout, ninja_cookie=ninja_cookie)
-    data = json.loads(payload)
-    snapshot = _parse_snapshot_payload(data, league, category, "itemoverview")
-    if snapshot is None:
-        raise ApiError("PoE item overview response missing expected data.")
-    _apply_exalted_values(snapshot.entries)
-    return snapshot
+    return _fetch_overview_snapshot(url, league, category, "itemoverview", timeout, ninja_cookie, use_cache=use_cache)
 
 
 def _fetch_poe2_snapshot(
@@ -585,16 +1426,152 @@ def _fetch_poe2_snapshot(
     category: str,
     timeout: int,
     ninja_cookie: Optional[str],
+    detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+    lazy_details: bool = False,
+    use_cache: bool = True,
+) -> CurrencySnapshot:
+    timer = _StageTimer()
+    try:
+        return _build_poe2_snapshot(
+            league, category, timeout, ninja_cookie, detail_concurrency, timer, lazy_details, use_cache
+        )
+    finally:
+        _resolution().flush()
+        _LAST_TIMINGS.clear()
+        _LAST_TIMINGS.update(timer.finish())
+
+
+def _build_poe2_snapshot(
+    league: str,
+    category: str,
+    timeout: int,
+    ninja_cookie: Optional[str],
+    detail_concurrency: int,
+    timer: _StageTimer,
+    lazy_details: bool = False,
+    use_cache: bool = True,
 ) -> CurrencySnapshot:
-    exchange_data = _fetch_poe2_exchange_overview(category, league, timeout, ninja_cookie)
+    # Lazy snapshots lack most details, so they are never handed to an eager caller.
+    memo_key = f"poe2|{league}|{category}" + ("|lazy" if lazy_details else "")
+    log = _RevalidationLog()
+    resolution = _resolution()
+    resolution_key = ResolutionMemo.make_key("poe2", league, category)
+    # The sources are independent until the merge, so fetch them side by side. The temp
+    # overview is only needed when the exchange has no rows; start it up front only when
+    # that was the case last time.
+    speculative_temp = resolution.preferred(resolution_key, "source") == "temp"
+    temp_items: Optional[List[dict]] = None
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="poe2-sources") as executor:
+        exchange_future = executor.submit(
+            timer.timed,
+            "exchange_overview",
+            _fetch_poe2_exchange_overview,
+            category,
+            league,
+            timeout,
+            ninja_cookie,
+            log,
+            use_cache,
+        )
+        overview_future = executor.submit(
+            timer.timed,
+            "overview_payload",
+            _fetch_poe2_overview_payload,
+            category,
+            league,
+            timeout,
+            ninja_cookie,
+            log,
+            use_cache,
+        )
+        temp_future = None
+        if speculative_temp:
+            temp_future = executor.submit(
+                timer.timed,
+                "temp_overview",
+                _fetch_poe2_items_with_aliases,
+                category,
+                league,
+                timeout,
+                ninja_cookie,
+                log,
+                use_cache,
+            )
+        exchange_data = exchange_future.result()
+        overview_payload = overview_future.result()
+        if temp_future is not None:
+            temp_items = temp_future.result()
+    reused = _SNAPSHOT_MEMO.reuse(memo_key, log)
+    if reused is not None:
+        return reused
     exchange_items, exchange_icons, exchange_names, exchange_divine_rate = _prepare_exchange_rows(exchange_data)
     items: List[dict] = list(exchange_items)
     source_type = "poe2-exchange" if items else "poe2-temp"
     if not items:
-        items = _fetch_poe2_items_with_aliases(category, league, timeout, ninja_cookie)
+        if temp_items is None:
+            temp_items = timer.timed(
+                "temp_overview", _fetch_poe2_items_with_aliases, category, league, timeout, ninja_cookie, log, use_cache
+            )
+            reused = _SNAPSHOT_MEMO.reuse(memo_key, log)
+            if reused is not None:
+                return reused
+        items = temp_items
     if not items:
         raise ApiError(f"No data returned for category '{category}' in league '{league}'.")
-    overview_payload = _fetch_poe2_overview_payload(category, league, timeout, ninja_cookie)
+    resolution.remember(resolution_key, "source", "exchange" if exchange_items else "temp")
+    # One index serves every merge stage and follows the entries as they are added, renamed and merged.
+    with timer.stage("merge"):
+        index, overview_index, icon_lookup, name_lookup, divine_rate = _merge_poe2_sources(
+            items,
+            overview_payload,
+            exchange_icons,
+            exchange_names,
+            exchange_divine_rate,
+        )
+    detail_context: Optional[_DetailContext] = None
+    if exchange_data:
+        detail_context = _apply_exchange_overview_data(
+            index,
+            exchange_data,
+            icon_lookup,
+            name_lookup,
+            league,
+            category,
+            timeout,
+            ninja_cookie,
+            detail_concurrency,
+            timer,
+            lazy_details,
+        )
+    with timer.stage("finalize"):
+        _add_unmatched_overview_entries(index, overview_index, icon_lookup, name_lookup, divine_rate)
+        entries = index.deduplicate()
+        if divine_rate and divine_rate > 0:
+            for entry in entries:
+                entry.divine_value = entry.chaos_value / divine_rate if entry.chaos_value else None
+        entries.sort(key=lambda item: item.chaos_value, reverse=True)
+        _apply_exalted_values(entries)
+    if detail_context is not None:
+        detail_context.divine_rate = divine_rate if divine_rate and divine_rate > 0 else None
+        with _DETAIL_CONTEXTS_LOCK:
+            _DETAIL_CONTEXTS[_detail_context_key(league, category)] = detail_context
+    snapshot = CurrencySnapshot(
+        league=league,
+        entries=entries,
+        fetched_at=time.time(),
+        source_type=f"{category}:{source_type}",
+    )
+    _SNAPSHOT_MEMO.remember(memo_key, log, snapshot)
+    return snapshot
+
+
+def _merge_poe2_sources(
+    items: List[dict],
+    overview_payload: Optional[dict],
+    exchange_icons: Dict[str, str],
+    exchange_names: Dict[str, str],
+    exchange_divine_rate: Optional[float],
+) -> Tuple[_EntryIndex, _EntryIndex, Dict[str, str], Dict[str, str], Optional[float]]:
     overview_lines: List[dict] = []
     overview_icons: Dict[str, str] = {}
     overview_names: Dict[str, str] = {}
@@ -630,32 +1607,9 @@ def _fetch_poe2_snapshot(
         divine_rate = _find_divine_from_overview(overview_lines)
     if not divine_rate and exchange_divine_rate:
         divine_rate = exchange_divine_rate
-    overview_lookup = _build_overview_lookup(overview_lines, icon_lookup, name_lookup)
-    entries = _merge_poe2_data(items, overview_lookup, icon_lookup, name_lookup, divine_rate)
-    if exchange_data:
-        _apply_exchange_overview_data(
-            entries,
-            exchange_data,
-            icon_lookup,
-            name_lookup,
-            league,
-            category,
-            timeout,
-            ninja_cookie,
-        )
-    _add_unmatched_overview_entries(entries, overview_lookup, icon_lookup, name_lookup, divine_rate)
-    entries = _deduplicate_entries(entries)
-    if divine_rate and divine_rate > 0:
-        for entry in entries:
-            entry.divine_value = entry.chaos_value / divine_rate if entry.chaos_value else None
-    entries.sort(key=lambda item: item.chaos_value, reverse=True)
-    _apply_exalted_values(entries)
-    return CurrencySnapshot(
-        league=league,
-        entries=entries,
-        fetched_at=time.time(),
-        source_type=f"{category}:{source_type}",
-    )
+    overview_index = _build_overview_index(overview_lines, name_lookup)
+    index = _merge_poe2_data(items, overview_index, icon_lookup, name_lookup, divine_rate)
+    return index, overview_index, icon_lookup, name_lookup, divine_rate
 
 
 def _fetch_poe2_items_with_aliases(
@@ -663,16 +1617,22 @@ def _fetch_poe2_items_with_aliases(
     league: str,
     timeout: int,
     ninja_cookie: Optional[str],
+    log: Optional[_RevalidationLog] = None,
+    use_cache: bool = True,
 ) -> List[dict]:
     normalized = (category or "").lower()
     aliases = POE2_OVERVIEW_ALIASES.get(normalized, [category])
+    memo = _resolution()
+    memo_key = ResolutionMemo.make_key("poe2", league, category)
+    candidates = _preferred_first(aliases + POE2_FALLBACK_OVERVIEWS, memo.preferred(memo_key, "temp_alias"), str)
     tried: set[str] = set()
-    for alias in aliases + POE2_FALLBACK_OVERVIEWS:
+    for alias in candidates:
         if not alias or alias in tried:
             continue
         tried.add(alias)
-        items = _fetch_poe2_items_once(alias, league, timeout, ninja_cookie)
+        items = _fetch_poe2_items_once(alias, league, timeout, ninja_cookie, log, use_cache)
         if items:
+            memo.remember(memo_key, "temp_alias", alias)
             return items
     return []
 
@@ -682,32 +1642,36 @@ def _fetch_poe2_items_once(
     league: str,
     timeout: int,
     ninja_cookie: Optional[str],
+    log: Optional[_RevalidationLog] = None,
+    use_cache: bool = True,
 ) -> List[dict]:
     params = {"leagueName": league, "overviewName": overview}
     query = urllib.parse.urlencode(params)
     url = f"{POE2_TEMP_OVERVIEW_URL}?{query}"
+    memo = _resolution()
+    if memo.is_negative(url):
+        return []
+    # The no-cache headers are for poe.ninja's CDN; the local response cache follows ``use_cache``.
     headers = {
         "Referer": "https://poe.ninja/",
         "Pragma": "no-cache",
         "Cache-Control": "no-cache",
     }
     try:
-        payload = _make_request(url, timeout, headers=headers, ninja_cookie=ninja_cookie)
-    except ApiError:
+        data = _request_json(url, timeout, headers=headers, ninja_cookie=ninja_cookie, log=log, use_cache=use_cache)
+    except ApiError as exc:
+        if exc.status == 404:
+            memo.mark_negative(url)
         return []
-    try:
-        data = json.loads(payload)
     except json.JSONDecodeError:
         return []
-    items = data.get("items")
-    if isinstance(items, list):
-        return items
-    lines = data.get("lines")
-    if isinstance(lines, list):
-        return lines
-    entries = data.get("entries")
-    if isinstance(entries, list):
-        return entries
+    for key in ("items", "lines", "entries"):
+        rows = data.get(key) if isinstance(data, dict) else None
+        if isinstance(rows, list):
+            if not rows:
+                memo.mark_negative(url)
+            return rows
+    memo.mark_negative(url)
     return []
 
 
@@ -716,18 +1680,25 @@ def _fetch_poe2_overview_payload(
     league: str,
     timeout: int,
     ninja_cookie: Optional[str],
+    log: Optional[_RevalidationLog] = None,
+    use_cache: bool = True,
 ) -> Optional[dict]:
     params = {"leagueName": league, "overviewName": category}
     query = urllib.parse.urlencode(params)
     url = f"{POE2_API_BASE_URL}/currencyoverview?{query}"
-    try:
-        payload = _make_request(url, timeout, ninja_cookie=ninja_cookie)
-    except ApiError:
+    memo = _resolution()
+    if memo.is_negative(url):
         return None
     try:
-        data = json.loads(payload)
+        data = _request_json(url, timeout, ninja_cookie=ninja_cookie, log=log, use_cache=use_cache)
+    except ApiError as exc:
+        if exc.status == 404:
+            memo.mark_negative(url)
+        return None
     except json.JSONDecodeError:
         return None
+    if not isinstance(data, dict):
+        return None
     payload_node = data.get("payload")
     if isinstance(payload_node, dict):
         return payload_node
@@ -741,30 +1712,46 @@ def _fetch_poe2_exchange_overview(
     league: str,
     timeout: int,
     ninja_cookie: Optional[str],
+    log: Optional[_RevalidationLog] = None,
+    use_cache: bool = True,
 ) -> Optional[dict]:
-    for base_url, league_key, category_key in POE2_EXCHANGE_OVERVIEW_ENDPOINTS:
+    memo = _resolution()
+    memo_key = ResolutionMemo.make_key("poe2", league, category)
+    endpoints = _preferred_first(
+        POE2_EXCHANGE_OVERVIEW_ENDPOINTS,
+        memo.preferred(memo_key, "exchange_overview"),
+        lambda endpoint: endpoint[0],
+    )
+    for base_url, league_key, category_key in endpoints:
         params = {league_key: league, category_key: category}
         query = urllib.parse.urlencode(params)
         url = f"{base_url}?{query}"
-        try:
-            payload = _make_request(url, timeout, ninja_cookie=ninja_cookie)
-        except ApiError:
+        if memo.is_negative(url):
             continue
         try:
-            data = json.loads(payload)
+            data = _request_json(url, timeout, ninja_cookie=ninja_cookie, log=log, use_cache=use_cache)
+        except ApiError as exc:
+            if exc.status == 404:
+                memo.mark_negative(url)
+            continue
         except json.JSONDecodeError:
             continue
         if not isinstance(data, dict) or not data:
+            memo.mark_negative(url)
             continue
         payload_node = data.get("payload")
-        if isinstance(payload_node, dict) and payload_node:
-            return payload_node
-        return data
+        node = payload_node if isinstance(payload_node, dict) and payload_node else data
+        if not node.get("lines"):
+            # An overview without lines cannot feed the merge; try the next variant.
+            memo.mark_negative(url)
+            continue
+        memo.remember(memo_key, "exchange_overview", base_url)
+        return node
     return None
 
 
 def _apply_exchange_overview_data(
-    entries: List[CurrencyEntry],
+    index: _EntryIndex,
     exchange_data: Optional[dict],
     icon_lookup: Dict[str, str],
     name_lookup: Dict[str, str],
@@ -772,37 +1759,36 @@ def _apply_exchange_overview_data(
     category: str,
     timeout: int,
     ninja_cookie: Optional[str],
-) -> None:
+    detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY,
+    timer: Optional[_StageTimer] = None,
+    lazy_details: bool = False,
+) -> Optional[_DetailContext]:
+    """Merge exchange overview lines into the indexed entries and enrich them with exchange details.
+
+    In lazy mode only remembered details are applied and the returned context
+    lets :func:`apply_exchange_detail` finish the job per entry later.
+    """
     if not exchange_data:
-        return
+        return None
+    timer = timer or _StageTimer()
     lines = exchange_data.get("lines")
     if not isinstance(lines, list):
-        return
+        return None
 
     core = exchange_data.get("core") or {}
     chaos_per_primary = _derive_chaos_per_primary(core)
     divine_rate_from_core = _normalize_divine_rate(
         _derive_divine_rate_from_core(core, chaos_per_primary)
     )
+    entries = index.rows
     if divine_rate_from_core:
         for entry in entries:
             if entry.chaos_value:
                 entry.divine_value = entry.chaos_value / divine_rate_from_core
 
-    entry_lookup: Dict[str, CurrencyEntry] = {}
-    for entry in entries:
-        keys = _collect_keys(entry.details_id, entry.name)
-        for key in keys:
-            entry_lookup.setdefault(key, entry)
-
+    line_fingerprints: Dict[str, str] = {}
     for line in lines:
-        line_keys = _collect_keys(line.get("id"), line.get("detailsId"), line.get("name"))
-        target_entry = None
-        for key in line_keys:
-            candidate = entry_lookup.get(key)
-            if candidate:
-                target_entry = candidate
-                break
+        target_entry = index.find(line.get("id"), line.get("detailsId"), line.get("name"))
         if target_entry is None:
             slug = line.get("id") or line.get("detailsId") or ""
             name = line.get("name") or name_lookup.get(slug) or _humanize_slug(slug) or "Unknown"
@@ -817,10 +1803,7 @@ def _apply_exchange_overview_data(
                 details_id=slug if slug else None,
                 icon_url=icon,
             )
-            entries.append(target_entry)
-            for key in line_keys:
-                if key:
-                    entry_lookup.setdefault(key, target_entry)
+            index.add(target_entry)
 
         chaos_value = _compute_exchange_chaos_value(line, chaos_per_primary)
         if chaos_value is not None:
@@ -862,21 +1845,32 @@ def _apply_exchange_overview_data(
         slug = line.get("id") or line.get("detailsId")
         if slug and not target_entry.details_id:
             target_entry.details_id = slug
+            index.rekey(target_entry)
         if slug and not target_entry.icon_url:
             target_entry.icon_url = icon_lookup.get(slug)
+        if target_entry.details_id:
+            line_fingerprints[target_entry.details_id] = _overview_fingerprint(line)
 
-    detail_ids = [
-        entry.details_id
-        for entry in entries[:MAX_DETAIL_ENTRIES]
-        if entry.details_id
-    ]
-    detail_data = _fetch_poe2_exchange_details(
-        league,
-        category,
-        detail_ids,
-        timeout,
-        ninja_cookie,
-    )
+    if lazy_details:
+        detail_ids = [entry.details_id for entry in entries if entry.details_id]
+        detail_data = _remembered_exchange_details(league, category, detail_ids, line_fingerprints)
+    else:
+        detail_ids = [
+            entry.details_id
+            for entry in entries[:MAX_DETAIL_ENTRIES]
+            if entry.details_id
+        ]
+        detail_data = timer.timed(
+            "exchange_details",
+            _fetch_poe2_exchange_details,
+            league,
+            category,
+            detail_ids,
+            timeout,
+            ninja_cookie,
+            detail_concurrency,
+            line_fingerprints,
+        )
     if detail_data:
         for entry in entries:
             if not entry.details_id:
@@ -891,6 +1885,32 @@ def _apply_exchange_overview_data(
                     chaos_per_primary,
                     divine_rate_from_core,
                 )
+                index.rekey(entry)
+    if not lazy_details:
+        return None
+    return _DetailContext(chaos_per_primary, divine_rate_from_core, icon_lookup, name_lookup, line_fingerprints)
+
+
+_FINGERPRINT_FIELDS = (
+    "primaryValue",
+    "secondaryValue",
+    "chaosValue",
+    "chaosEquivalent",
+    "valueChaos",
+    "volume",
+    "volumePrimaryValue",
+    "volumeSecondaryValue",
+    "change",
+)
+
+
+def _overview_fingerprint(line: dict) -> str:
+    """Summary of the value, volume and change fields of an exchange overview line."""
+    parts: List[object] = [line.get(name) for name in _FINGERPRINT_FIELDS]
+    for name in ("sparkLine", "sparkline"):
+        node = line.get(name)
+        parts.append(node.get("totalChange") if isinstance(node, dict) else None)
+    return repr(parts)
 
 
 def _derive_chaos_per_primary(core: dict) -> Optional[float]:
@@ -969,34 +1989,155 @@ def _fetch_poe2_exchange_details(
     ids: Iterable[str],
     timeout: int,
     ninja_cookie: Optional[str],
+    max_in_flight: int = DEFAULT_DETAIL_CONCURRENCY,
+    fingerprints: Optional[Dict[str, str]] = None,
 ) -> Dict[str, dict]:
-    details: Dict[str, dict] = {}
-    for index, item_id in enumerate(ids):
-        if index >= MAX_DETAIL_ENTRIES:
-            break
-        for base_url, league_key, category_key in POE2_EXCHANGE_DETAILS_ENDPOINTS:
-            params = {league_key: league, category_key: category, "id": item_id}
-            query = urllib.parse.urlencode(params)
-            url = f"{base_url}?{query}"
-            try:
-                payload = _make_request(url, timeout, ninja_cookie=ninja_cookie)
-            except ApiError:
-                continue
-            try:
-                data = json.loads(payload)
-            except json.JSONDecodeError:
-                continue
-            if not isinstance(data, dict) or not data:
-                continue
-            payload_node = data.get("payload")
-            if isinstance(payload_node, dict) and payload_node:
-                details[item_id] = payload_node
-                break
-            details[item_id] = data
+    """Exchange details per id; ids whose overview line is unchanged reuse the remembered detail."""
+    selected: List[str] = []
+    for item_id in ids:
+        if len(selected) >= MAX_DETAIL_ENTRIES:
             break
+        if item_id not in selected:
+            selected.append(item_id)
+    if not selected:
+        return {}
+    fingerprints = fingerprints or {}
+    details: Dict[str, Optional[dict]] = {}
+    stale: List[str] = []
+    missing: List[str] = []
+    for item_id in selected:
+        found, detail = _DETAIL_MEMO.lookup(league, category, item_id, fingerprints.get(item_id))
+        if found:
+            details[item_id] = detail
+        elif found is None:
+            missing.append(item_id)
+        else:
+            stale.append(item_id)
+
+    def _fetch(item_id: str) -> Optional[dict]:
+        # A changed line means the detail changed too, so skip the raw response cache.
+        return _fetch_poe2_exchange_detail(league, category, item_id, timeout, ninja_cookie, fresh=item_id in stale_ids)
+
+    stale_ids = set(stale)
+    pending = missing + stale
+    workers = max(1, min(max_in_flight, MAX_DETAIL_CONCURRENCY, len(pending)))
+    if not pending:
+        results: List[Optional[dict]] = []
+    elif workers == 1:
+        results = [_fetch(item_id) for item_id in pending]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poe2-details") as executor:
+            # map() yields in submission order, so the result does not depend on completion order.
+            results = list(executor.map(_fetch, pending))
+    for item_id, detail in zip(pending, results):
+        _DETAIL_MEMO.remember(league, category, item_id, fingerprints.get(item_id), detail)
+        details[item_id] = detail
+    return {item_id: details[item_id] for item_id in selected if details.get(item_id)}
+
+
+def _remembered_exchange_details(
+    league: str,
+    category: str,
+    ids: Iterable[str],
+    fingerprints: Dict[str, str],
+) -> Dict[str, dict]:
+    details: Dict[str, dict] = {}
+    for item_id in ids:
+        if item_id in details:
+            continue
+        found, detail = _DETAIL_MEMO.lookup(league, category, item_id, fingerprints.get(item_id))
+        if found and detail:
+            details[item_id] = detail
     return details
 
 
+def fetch_exchange_detail(
+    league: str,
+    category: str,
+    details_id: str,
+    *,
+    timeout: int = DEFAULT_TIMEOUT,
+    ninja_cookie: Optional[str] = None,
+) -> Optional[dict]:
+    """Exchange detail of one entry of a lazily built PoE2 snapshot (``None`` when unavailable).
+
+    A detail remembered for the same overview line is returned without a request.
+    """
+    with _DETAIL_CONTEXTS_LOCK:
+        context = _DETAIL_CONTEXTS.get(_detail_context_key(league, category))
+    if context is None or details_id not in context.fingerprints:
+        return None
+    fingerprint = context.fingerprints[details_id]
+    found, detail = _DETAIL_MEMO.lookup(league, category, details_id, fingerprint)
+    if found:
+        return detail
+    try:
+        detail = _fetch_poe2_exchange_detail(league, category, details_id, timeout, ninja_cookie, fresh=found is False)
+    finally:
+        _responses().flush()
+    _DETAIL_MEMO.remember(league, category, details_id, fingerprint, detail)
+    return detail
+
+
+def apply_exchange_detail(league: str, category: str, entry: CurrencyEntry, detail: dict) -> bool:
+    """Merge a detail from :func:`fetch_exchange_detail` into ``entry``; ``False`` when it cannot be applied."""
+    with _DETAIL_CONTEXTS_LOCK:
+        context = _DETAIL_CONTEXTS.get(_detail_context_key(league, category))
+    if context is None or not detail:
+        return False
+    _update_entry_from_exchange_detail(
+        entry,
+        detail,
+        context.icon_lookup,
+        context.name_lookup,
+        context.chaos_per_primary,
+        context.divine_rate_from_core,
+    )
+    if context.divine_rate:
+        entry.divine_value = entry.chaos_value / context.divine_rate if entry.chaos_value else None
+    return True
+
+
+def _fetch_poe2_exchange_detail(
+    league: str,
+    category: str,
+    item_id: str,
+    timeout: int,
+    ninja_cookie: Optional[str],
+    fresh: bool = False,
+) -> Optional[dict]:
+    memo = _resolution()
+    memo_key = ResolutionMemo.make_key("poe2", league, category)
+    endpoints = _preferred_first(
+        POE2_EXCHANGE_DETAILS_ENDPOINTS,
+        memo.preferred(memo_key, "exchange_details"),
+        lambda endpoint: endpoint[0],
+    )
+    for base_url, league_key, category_key in endpoints:
+        params = {league_key: league, category_key: category, "id": item_id}
+        query = urllib.parse.urlencode(params)
+        url = f"{base_url}?{query}"
+        if memo.is_negative(url):
+            continue
+        try:
+            data = _request_json(url, timeout, ninja_cookie=ninja_cookie, use_cache=not fresh)
+        except ApiError as exc:
+            if exc.status == 404:
+                memo.mark_negative(url)
+            continue
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(data, dict) or not data:
+            memo.mark_negative(url)
+            continue
+        memo.remember(memo_key, "exchange_details", base_url)
+        payload_node = data.get("payload")
+        if isinstance(payload_node, dict) and payload_node:
+            return payload_node
+        return data
+    return None
+
+
 def _update_entry_from_exchange_detail(
     entry: CurrencyEntry,
     detail: dict,
@@ -1086,41 +2227,30 @@ def _extract_history_series(history: object) -> List[float]:
     return values
 
 
-def _build_overview_lookup(
-    lines: Iterable[dict],
-    icon_lookup: Dict[str, str],
-    name_lookup: Dict[str, str],
-) -> Dict[str, dict]:
-    lookup: Dict[str, dict] = {}
-    for line in lines:
-        names = [
+def _build_overview_index(lines: Iterable[dict], name_lookup: Dict[str, str]) -> _EntryIndex:
+    def _line_key_values(line: dict) -> Tuple[object, ...]:
+        details_id = line.get("detailsId")
+        mapped_name = name_lookup.get(details_id) if isinstance(details_id, str) else None
+        return (
             line.get("currencyTypeName"),
             line.get("name"),
-            line.get("detailsId"),
+            details_id,
             line.get("id"),
-        ]
-        for key in _collect_keys(*names):
-            lookup[key] = line
-        currency_id = line.get("currencyId")
-        if isinstance(currency_id, (int, float, str)):
-            lookup[str(currency_id)] = line
-        details_id = line.get("detailsId")
-        if isinstance(details_id, str):
-            mapped_name = name_lookup.get(details_id)
-            if mapped_name:
-                for key in _collect_keys(mapped_name):
-                    lookup[key] = line
-    return lookup
+            line.get("currencyId"),
+            mapped_name,
+        )
+
+    return _EntryIndex(lines, _line_key_values)
 
 
 def _merge_poe2_data(
     items: Iterable[dict],
-    overview_lookup: Dict[str, dict],
+    overview_index: _EntryIndex,
     icon_lookup: Dict[str, str],
     name_lookup: Dict[str, str],
     divine_rate: Optional[float],
-) -> List[CurrencyEntry]:
-    entries: List[CurrencyEntry] = []
+) -> _EntryIndex:
+    index = _EntryIndex()
 
     for row in items:
         item_node = row.get("item")
@@ -1152,40 +2282,31 @@ def _merge_poe2_data(
         if divine_rate and divine_rate > 0 and entry.chaos_value:
             entry.divine_value = entry.chaos_value / divine_rate
 
-        keys = set(_collect_keys(name, details_id, currency_id, row.get("detailsId"), row.get("id")))
-        entries.append(entry)
-
-        overview_line = None
-        for key in keys:
-            overview_line = overview_lookup.get(key)
-            if overview_line:
-                break
+        overview_line = overview_index.find(name, details_id, currency_id, row.get("detailsId"), row.get("id"))
         if overview_line:
             _update_entry_from_overview(entry, overview_line, icon_lookup, name_lookup, divine_rate)
+        index.add(entry)
 
-    return entries
+    return index
 
 
 def _add_unmatched_overview_entries(
-    entries: List[CurrencyEntry],
-    overview_lookup: Dict[str, dict],
+    index: _EntryIndex,
+    overview_index: _EntryIndex,
     icon_lookup: Dict[str, str],
     name_lookup: Dict[str, str],
     divine_rate: Optional[float],
 ) -> None:
-    existing_keys = set()
-    for entry in entries:
-        existing_keys.update(
-            _collect_keys(entry.name, entry.details_id)
-        )
-    for line in overview_lookup.values():
+    for line in overview_index.rows:
+        if not overview_index.keys_of(line):
+            continue
         name_candidates = _collect_keys(
             line.get("currencyTypeName"),
             line.get("name"),
             line.get("detailsId"),
             line.get("id"),
         )
-        if any(key in existing_keys for key in name_candidates):
+        if any(key in index for key in name_candidates):
             continue
         entry = CurrencyEntry(
             name=line.get("currencyTypeName") or line.get("name") or "Unknown",
@@ -1200,8 +2321,7 @@ def _add_unmatched_overview_entries(
         _update_entry_from_overview(entry, line, icon_lookup, name_lookup, divine_rate)
         if divine_rate and divine_rate > 0 and entry.chaos_value:
             entry.divine_value = entry.chaos_value / divine_rate
-        entries.append(entry)
-        existing_keys.update(_collect_keys(entry.name, entry.details_id))
+        index.add(entry)
 
 
 def _update_entry_from_overview(
@@ -1376,23 +2496,82 @@ def _parse_snapshot_payload(
     if not isinstance(lines, list):
         return None
 
-    currency_details = (
-        working.get("currencyDetails")
-        or working.get("currencyDetailsMap")
-        or working.get("currencyData")
-        or working.get("details")
+    icon_lookup, name_lookup = _build_detail_maps(_currency_detail_items(working))
+
+    divine_chaos_value = _find_divine_chaos_value(lines)
+    entries = _parse_currency_lines(lines, divine_chaos_value, icon_lookup, name_lookup)
+    entries.sort(key=lambda item: item.chaos_value, reverse=True)
+    return CurrencySnapshot(
+        league=league,
+        entries=entries,
+        fetched_at=time.time(),
+        source_type=f"{category}:{source}",
     )
+
+
+_CURRENCY_DETAIL_KEYS = ("currencyDetails", "currencyDetailsMap", "currencyData", "details")
+
+
+def _currency_detail_items(working: Dict[str, Any]) -> List[object]:
+    currency_details = None
+    for key in _CURRENCY_DETAIL_KEYS:
+        currency_details = working.get(key)
+        if currency_details:
+            break
     if isinstance(currency_details, dict):
-        details_iterable = list(currency_details.values())
-    elif isinstance(currency_details, list):
-        details_iterable = currency_details
-    else:
-        details_iterable = []
+        return list(currency_details.values())
+    if isinstance(currency_details, list):
+        return currency_details
+    return []
 
-    icon_lookup, name_lookup = _build_detail_maps(details_iterable)
 
-    divine_chaos_value = _find_divine_chaos_value(lines)
-    entries = _parse_currency_lines(lines, divine_chaos_value, icon_lookup, name_lookup)
+def _parse_snapshot_stream(
+    body: bytes,
+    league: str,
+    category: str,
+    source: str,
+) -> Optional[CurrencySnapshot]:
+    """Streaming counterpart of ``_parse_snapshot_payload`` for large overviews.
+
+    Elements of the top-level ``lines`` array are decoded and converted to
+    entries one at a time, so the full list of line dicts never exists. The
+    divine rate depends on a line that may come late, so it is applied once
+    the array is done. Returns ``None`` for documents the streaming path does
+    not cover (not an object, a ``payload`` wrapper, no, empty or repeated
+    ``lines``, a line that is not an object, or detail maps after the lines);
+    the caller then falls back to the generic parser.
+    """
+    text = decode_body(body)
+    if not is_object(text):
+        return None
+    header: Dict[str, Any] = {}
+    entries: List[CurrencyEntry] = []
+    lookups: Optional[Tuple[Dict[str, str], Dict[str, str]]] = None
+    divine_found = False
+    divine_chaos_value: Optional[float] = None
+    shapes = _LineShapes()
+    streamed = False
+    # Projection is not used here: one line is held at a time anyway, and the hook only costs time.
+    for key, value, is_element in iter_members(text, ("lines",)):
+        if not is_element:
+            if key in ("payload", "lines") or (streamed and key in _CURRENCY_DETAIL_KEYS):
+                return None
+            header[key] = value
+            continue
+        if not isinstance(value, dict):
+            return None
+        if lookups is None:
+            lookups = _build_detail_maps(_currency_detail_items(header))
+        if not divine_found and _is_divine_line(value):
+            divine_found = True
+            divine_chaos_value = _extract_float(value.get("chaosEquivalent"))
+        entries.append(shapes.parse(value, None, lookups[0], lookups[1]))
+        streamed = True
+    if not entries:
+        return None
+    if divine_chaos_value and divine_chaos_value > 0:
+        for entry in entries:
+            entry.divine_value = entry.chaos_value / divine_chaos_value
     entries.sort(key=lambda item: item.chaos_value, reverse=True)
     return CurrencySnapshot(
         league=league,
@@ -1404,106 +2583,120 @@ def _parse_snapshot_payload(
 
 def _find_divine_chaos_value(lines: Iterable[dict]) -> Optional[float]:
     for line in lines:
-        name = line.get("currencyTypeName")
-        details_id = line.get("detailsId")
-        currency_node = _extract_currency_node(line)
-        node_name = None
-        node_details = None
-        if isinstance(currency_node, dict):
-            node_name = currency_node.get("name")
-            node_details = currency_node.get("detailsId")
-        if name == "Divine Orb" or node_name == "Divine Orb":
-            return _extract_float(line.get("chaosEquivalent"))
-        if isinstance(details_id, str) and "divine" in details_id:
-            return _extract_float(line.get("chaosEquivalent"))
-        if isinstance(node_details, str) and "divine" in node_details:
+        if _is_divine_line(line):
             return _extract_float(line.get("chaosEquivalent"))
     return None
 
 
+def _is_divine_line(line: dict) -> bool:
+    name = line.get("currencyTypeName")
+    details_id = line.get("detailsId")
+    currency_node = _extract_currency_node(line)
+    node_name = None
+    node_details = None
+    if isinstance(currency_node, dict):
+        node_name = currency_node.get("name")
+        node_details = currency_node.get("detailsId")
+    if name == "Divine Orb" or node_name == "Divine Orb":
+        return True
+    if isinstance(details_id, str) and "divine" in details_id:
+        return True
+    return isinstance(node_details, str) and "divine" in node_details
+
+
 def _parse_currency_lines(
     lines: Iterable[dict],
     divine_chaos_value: Optional[float],
     icon_lookup: Dict[str, str],
     name_lookup: Dict[str, str],
 ) -> List[CurrencyEntry]:
-    entries: List[CurrencyEntry] = []
-    for line in lines:
-        name = _infer_currency_name(line, name_lookup)
-        chaos_value = _infer_chaos_value(line)
+    shapes = _LineShapes()
+    return [shapes.parse(line, divine_chaos_value, icon_lookup, name_lookup) for line in lines]
 
-        change_percent = None
-        receive_spark = line.get("receiveSparkLine")
-        if isinstance(receive_spark, dict):
-            change_percent = _extract_float(receive_spark.get("totalChange"))
-        if change_percent is None:
-            pay_spark = line.get("paySparkLine")
-            if isinstance(pay_spark, dict):
-                change_percent = _extract_float(pay_spark.get("totalChange"))
-        if change_percent is None:
-            generic_spark = line.get("sparkLine") or line.get("sparkline")
-            if isinstance(generic_spark, dict):
-                change_percent = _extract_float(generic_spark.get("totalChange"))
 
-        sparkline = (
-            _extract_sparkline(receive_spark)
-            or _extract_sparkline(line.get("paySparkLine"))
-            or _extract_sparkline(line.get("sparkLine"))
-        )
-        trade_count = (
-            _extract_trade_count(line.get("receive"))
-            or _extract_trade_count(line.get("pay"))
-            or _extract_trade_count(line)
-        )
-        if not trade_count:
-            volume = (
-                _extract_float(line.get("volume"))
-                or _extract_float(line.get("volumeSecondaryValue"))
-                or _extract_float(line.get("volumePrimaryValue"))
-            )
+def _parse_currency_line(
+    line: dict,
+    divine_chaos_value: Optional[float],
+    icon_lookup: Dict[str, str],
+    name_lookup: Dict[str, str],
+) -> CurrencyEntry:
+    name = _infer_currency_name(line, name_lookup)
+    chaos_value = _infer_chaos_value(line)
+
+    change_percent = None
+    receive_spark = line.get("receiveSparkLine")
+    if isinstance(receive_spark, dict):
+        change_percent = _extract_float(receive_spark.get("totalChange"))
+    if change_percent is None:
+        pay_spark = line.get("paySparkLine")
+        if isinstance(pay_spark, dict):
+            change_percent = _extract_float(pay_spark.get("totalChange"))
+    if change_percent is None:
+        generic_spark = line.get("sparkLine") or line.get("sparkline")
+        if isinstance(generic_spark, dict):
+            change_percent = _extract_float(generic_spark.get("totalChange"))
+
+    sparkline = (
+        _extract_sparkline(receive_spark)
+        or _extract_sparkline(line.get("paySparkLine"))
+        or _extract_sparkline(line.get("sparkLine"))
+    )
+    trade_count = (
+        _extract_trade_count(line.get("receive"))
+        or _extract_trade_count(line.get("pay"))
+        or _extract_trade_count(line)
+    )
+    if not trade_count:
+        for key in _VOLUME_KEYS:
+            volume = _extract_float(line.get(key))
             if volume:
                 trade_count = int(round(volume))
+                break
 
-        divine_value = None
-        if divine_chaos_value and divine_chaos_value > 0:
-            divine_value = chaos_value / divine_chaos_value
-
-        currency_node = _extract_currency_node(line)
-        details_id = _infer_details_id(line, currency_node)
-        currency_id = _infer_currency_id(line, currency_node)
-        icon = None
-        if isinstance(name, str):
-            icon = icon_lookup.get(name)
-        if icon is None and isinstance(details_id, str):
-            icon = icon_lookup.get(details_id)
-        if icon is None and isinstance(currency_id, (int, float, str)):
-            icon = icon_lookup.get(str(currency_id))
-        if icon is None and isinstance(currency_node, dict):
-            icon = currency_node.get("icon")
+    divine_value = None
+    if divine_chaos_value and divine_chaos_value > 0:
+        divine_value = chaos_value / divine_chaos_value
 
-        entries.append(
-            CurrencyEntry(
-                name=str(name),
-                chaos_value=chaos_value,
-                divine_value=divine_value,
-                change_percent=change_percent,
-                sparkline=sparkline,
-                trade_count=trade_count,
-                details_id=details_id if isinstance(details_id, str) else None,
-                icon_url=icon,
-            )
-        )
-    return entries
+    currency_node = _extract_currency_node(line)
+    details_id = _infer_details_id(line, currency_node)
+    currency_id = _infer_currency_id(line, currency_node)
+    icon = None
+    if isinstance(name, str):
+        icon = icon_lookup.get(name)
+    if icon is None and isinstance(details_id, str):
+        icon = icon_lookup.get(details_id)
+    if icon is None and isinstance(currency_id, (int, float, str)):
+        icon = icon_lookup.get(str(currency_id))
+    if icon is None and isinstance(currency_node, dict):
+        icon = currency_node.get("icon")
+
+    return CurrencyEntry(
+        name=str(name),
+        chaos_value=chaos_value,
+        divine_value=divine_value,
+        change_percent=change_percent,
+        sparkline=sparkline,
+        trade_count=trade_count,
+        details_id=details_id if isinstance(details_id, str) else None,
+        icon_url=icon,
+    )
 
 
 def _extract_sparkline(sparkline: object) -> List[float]:
     if isinstance(sparkline, list):
-        return [value for value in (_extract_float(item) for item in sparkline) if value is not None]
-    if not isinstance(sparkline, dict):
-        return []
-    data = sparkline.get("data") or sparkline.get("values") or sparkline.get("sparkLine")
-    if not isinstance(data, list):
+        data = sparkline
+    elif isinstance(sparkline, dict):
+        data = sparkline.get("data") or sparkline.get("values") or sparkline.get("sparkLine")
+        if not isinstance(data, list):
+            return []
+    else:
         return []
+    try:
+        # Decoded JSON holds only numbers, strings, null, lists and dicts, and
+        # float() accepts exactly the values _extract_float keeps.
+        return [float(item) for item in data]
+    except (TypeError, ValueError):
+        pass
     result = []
     for item in data:
         float_value = _extract_float(item)
@@ -1512,10 +2705,13 @@ def _extract_sparkline(sparkline: object) -> List[float]:
     return result
 
 
+_TRADE_COUNT_KEYS = ("count", "volume", "listingCount", "total")
+
+
 def _extract_trade_count(node: object) -> Optional[int]:
     if not isinstance(node, dict):
         return None
-    for key in ("count", "volume", "listingCount", "total"):
+    for key in _TRADE_COUNT_KEYS:
         value = node.get(key)
         if isinstance(value, int):
             return value
@@ -1524,40 +2720,64 @@ def _extract_trade_count(node: object) -> Optional[int]:
     return None
 
 
+_CURRENCY_NODE_KEYS = (
+    "currency",
+    "payCurrency",
+    "targetCurrency",
+    "receiveCurrency",
+    "item",
+    "currencyDetails",
+    "details",
+)
+_CURRENCY_ID_KEYS = (
+    "currencyId",
+    "id",
+    "receiveCurrencyId",
+    "payCurrencyId",
+    "targetCurrencyId",
+    "itemId",
+    "currencyTypeId",
+)
+_DETAILS_ID_KEYS = (
+    "detailsId",
+    "detailId",
+    "currencyDetailsId",
+    "payCurrencyDetailsId",
+    "receiveCurrencyDetailsId",
+)
+_NAME_FIELDS = (
+    "currencyTypeName",
+    "name",
+    "displayName",
+    "itemName",
+    "currencyName",
+    "receiveCurrencyName",
+    "payCurrencyName",
+    "receiveCurrencyTypeName",
+    "payCurrencyTypeName",
+    "typeName",
+)
+_CHAOS_VALUE_KEYS = ("chaosEquivalent", "chaosValue", "valueChaos", "value")
+_VOLUME_KEYS = ("volume", "volumeSecondaryValue", "volumePrimaryValue")
+
+
 def _extract_currency_node(line: dict) -> Optional[dict]:
-    candidates = [
-        line.get("currency"),
-        line.get("payCurrency"),
-        line.get("targetCurrency"),
-        line.get("receiveCurrency"),
-        line.get("item"),
-        line.get("currencyDetails"),
-        line.get("details"),
-    ]
-    for node in candidates:
+    for key in _CURRENCY_NODE_KEYS:
+        node = line.get(key)
         if isinstance(node, dict):
             return node
     return None
 
 
 def _infer_currency_id(line: dict, currency_node: Optional[dict]) -> Optional[str]:
-    candidate_keys = [
-        "currencyId",
-        "id",
-        "receiveCurrencyId",
-        "payCurrencyId",
-        "targetCurrencyId",
-        "itemId",
-        "currencyTypeId",
-    ]
-    for key in candidate_keys:
+    for key in _CURRENCY_ID_KEYS:
         value = line.get(key)
         if isinstance(value, (int, float)):
             return str(int(value))
         if isinstance(value, str) and value:
             return value
     if isinstance(currency_node, dict):
-        for key in candidate_keys:
+        for key in _CURRENCY_ID_KEYS:
             value = currency_node.get(key)
             if isinstance(value, (int, float)):
                 return str(int(value))
@@ -1567,19 +2787,12 @@ def _infer_currency_id(line: dict, currency_node: Optional[dict]) -> Optional[st
 
 
 def _infer_details_id(line: dict, currency_node: Optional[dict]) -> Optional[str]:
-    candidate_keys = [
-        "detailsId",
-        "detailId",
-        "currencyDetailsId",
-        "payCurrencyDetailsId",
-        "receiveCurrencyDetailsId",
-    ]
-    for key in candidate_keys:
+    for key in _DETAILS_ID_KEYS:
         value = line.get(key)
         if isinstance(value, str):
             return value
     if isinstance(currency_node, dict):
-        for key in candidate_keys:
+        for key in _DETAILS_ID_KEYS:
             value = currency_node.get(key)
             if isinstance(value, str):
                 return value
@@ -1589,25 +2802,13 @@ def _infer_details_id(line: dict, currency_node: Optional[dict]) -> Optional[str
 
 
 def _infer_currency_name(line: dict, name_lookup: Dict[str, str]) -> str:
-    name_fields = [
-        "currencyTypeName",
-        "name",
-        "displayName",
-        "itemName",
-        "currencyName",
-        "receiveCurrencyName",
-        "payCurrencyName",
-        "receiveCurrencyTypeName",
-        "payCurrencyTypeName",
-        "typeName",
-    ]
     receive_name = line.get("receiveCurrencyName") or line.get("receiveCurrencyTypeName")
     pay_name = line.get("payCurrencyName") or line.get("payCurrencyTypeName")
     if isinstance(receive_name, str) and isinstance(pay_name, str):
         combo = f"{receive_name} for {pay_name}"
         if combo.strip():
             return combo
-    for field in name_fields:
+    for field in _NAME_FIELDS:
         value = line.get(field)
         if isinstance(value, str) and value.strip():
             return value
@@ -1637,7 +2838,7 @@ def _infer_currency_name(line: dict, name_lookup: Dict[str, str]) -> str:
 
 
 def _infer_chaos_value(line: dict) -> float:
-    for key in ("chaosEquivalent", "chaosValue", "valueChaos", "value"):
+    for key in _CHAOS_VALUE_KEYS:
         value = _extract_float(line.get(key))
         if value is not None:
             return value
@@ -1660,3 +2861,237 @@ def _infer_chaos_value(line: dict) -> float:
             if value is not None:
                 return value
     return 0.0
+
+
+# Shape changes tolerated within one response before its remaining lines go to the generic parser.
+MAX_LINE_SHAPES = 8
+
+
+class _LineExtractor:
+    """``_parse_currency_line`` specialized to lines whose keys all belong to ``shape``.
+
+    A key missing from a line reads as ``None`` in the generic parser, and
+    every probe skips ``None``, so probes of keys outside the shape are
+    dropped up front. Results are identical to the generic parser; when a
+    step finds nothing the generic helper for that step finishes it.
+    """
+
+    __slots__ = (
+        "shape",
+        "combo_names",
+        "name_fields",
+        "chaos_keys",
+        "receive_spark",
+        "pay_spark",
+        "generic_spark",
+        "spark_keys",
+        "trade_nodes",
+        "trade_keys",
+        "volume_keys",
+        "node_keys",
+        "details_keys",
+        "id_keys",
+    )
+
+    def __init__(self, shape: FrozenSet[str]) -> None:
+        def present(keys: Iterable[str]) -> Tuple[str, ...]:
+            return tuple(key for key in keys if key in shape)
+
+        self.shape = shape
+        self.combo_names = bool(present(("receiveCurrencyName", "receiveCurrencyTypeName"))) and bool(
+            present(("payCurrencyName", "payCurrencyTypeName"))
+        )
+        self.name_fields = present(_NAME_FIELDS)
+        self.chaos_keys = present(_CHAOS_VALUE_KEYS)
+        self.receive_spark = "receiveSparkLine" in shape
+        self.pay_spark = "paySparkLine" in shape
+        self.generic_spark = "sparkLine" in shape or "sparkline" in shape
+        self.spark_keys = present(("receiveSparkLine", "paySparkLine", "sparkLine"))
+        self.trade_nodes = present(("receive", "pay"))
+        self.trade_keys = present(_TRADE_COUNT_KEYS)
+        self.volume_keys = present(_VOLUME_KEYS)
+        self.node_keys = present(_CURRENCY_NODE_KEYS)
+        self.details_keys = present(_DETAILS_ID_KEYS)
+        self.id_keys = present(_CURRENCY_ID_KEYS)
+
+    def parse(
+        self,
+        line: dict,
+        divine_chaos_value: Optional[float],
+        icon_lookup: Dict[str, str],
+        name_lookup: Dict[str, str],
+    ) -> CurrencyEntry:
+        name = self._name(line, name_lookup)
+        chaos_value = self._chaos_value(line)
+
+        change_percent = None
+        if self.receive_spark:
+            receive_spark = line.get("receiveSparkLine")
+            if isinstance(receive_spark, dict):
+                change_percent = _extract_float(receive_spark.get("totalChange"))
+        if change_percent is None and self.pay_spark:
+            pay_spark = line.get("paySparkLine")
+            if isinstance(pay_spark, dict):
+                change_percent = _extract_float(pay_spark.get("totalChange"))
+        if change_percent is None and self.generic_spark:
+            generic_spark = line.get("sparkLine") or line.get("sparkline")
+            if isinstance(generic_spark, dict):
+                change_percent = _extract_float(generic_spark.get("totalChange"))
+
+        sparkline: List[float] = []
+        for key in self.spark_keys:
+            sparkline = _extract_sparkline(line.get(key))
+            if sparkline:
+                break
+
+        trade_count = None
+        for key in self.trade_nodes:
+            trade_count = _extract_trade_count(line.get(key))
+            if trade_count:
+                break
+        if not trade_count:
+            trade_count = self._line_trade_count(line)
+        if not trade_count:
+            for key in self.volume_keys:
+                volume = _extract_float(line.get(key))
+                if volume:
+                    trade_count = int(round(volume))
+                    break
+
+        divine_value = None
+        if divine_chaos_value and divine_chaos_value > 0:
+            divine_value = chaos_value / divine_chaos_value
+
+        currency_node = self._currency_node(line)
+        details_id = self._details_id(line, currency_node)
+        currency_id = self._currency_id(line, currency_node)
+        icon = None
+        if isinstance(name, str):
+            icon = icon_lookup.get(name)
+        if icon is None and isinstance(details_id, str):
+            icon = icon_lookup.get(details_id)
+        if icon is None and isinstance(currency_id, (int, float, str)):
+            icon = icon_lookup.get(str(currency_id))
+        if icon is None and isinstance(currency_node, dict):
+            icon = currency_node.get("icon")
+
+        return CurrencyEntry(
+            name=str(name),
+            chaos_value=chaos_value,
+            divine_value=divine_value,
+            change_percent=change_percent,
+            sparkline=sparkline,
+            trade_count=trade_count,
+            details_id=details_id if isinstance(details_id, str) else None,
+            icon_url=icon,
+        )
+
+    def _name(self, line: dict, name_lookup: Dict[str, str]) -> str:
+        if self.combo_names:
+            receive_name = line.get("receiveCurrencyName") or line.get("receiveCurrencyTypeName")
+            pay_name = line.get("payCurrencyName") or line.get("payCurrencyTypeName")
+            if isinstance(receive_name, str) and isinstance(pay_name, str):
+                return f"{receive_name} for {pay_name}"
+        for field in self.name_fields:
+            value = line.get(field)
+            if isinstance(value, str) and value.strip():
+                return value
+        return _infer_currency_name(line, name_lookup)
+
+    def _chaos_value(self, line: dict) -> float:
+        for key in self.chaos_keys:
+            value = _extract_float(line.get(key))
+            if value is not None:
+                return value
+        return _infer_chaos_value(line)
+
+    def _line_trade_count(self, line: dict) -> Optional[int]:
+        for key in self.trade_keys:
+            value = line.get(key)
+            if isinstance(value, int):
+                return value
+            if isinstance(value, float):
+                return int(value)
+        return None
+
+    def _currency_node(self, line: dict) -> Optional[dict]:
+        for key in self.node_keys:
+            node = line.get(key)
+            if isinstance(node, dict):
+                return node
+        return None
+
+    def _currency_id(self, line: dict, currency_node: Optional[dict]) -> Optional[str]:
+        for key in self.id_keys:
+            value = line.get(key)
+            if isinstance(value, (int, float)):
+                return str(int(value))
+            if isinstance(value, str) and value:
+                return value
+        if isinstance(currency_node, dict):
+            for key in _CURRENCY_ID_KEYS:
+                value = currency_node.get(key)
+                if isinstance(value, (int, float)):
+                    return str(int(value))
+                if isinstance(value, str) and value:
+                    return value
+        return None
+
+    def _details_id(self, line: dict, currency_node: Optional[dict]) -> Optional[str]:
+        for key in self.details_keys:
+            value = line.get(key)
+            if isinstance(value, str):
+                return value
+        if isinstance(currency_node, dict):
+            for key in _DETAILS_ID_KEYS:
+                value = currency_node.get(key)
+                if isinstance(value, str):
+                    return value
+        return self._currency_id(line, currency_node)
+
+
+@lru_cache(maxsize=64)
+def _line_extractor(shape: FrozenSet[str]) -> _LineExtractor:
+    return _LineExtractor(shape)
+
+
+class _LineShapes:
+    """Picks the extractor for each line of one response.
+
+    All lines of a response normally share one shape, so it is fingerprinted
+    from the first line and each later line only checks that its keys fit.
+    A line with new keys widens the shape; after ``MAX_LINE_SHAPES`` changes
+    the response counts as irregular and the rest goes to the generic parser.
+    """
+
+    __slots__ = ("extractor", "changes")
+
+    def __init__(self) -> None:
+        self.extractor: Optional[_LineExtractor] = None
+        self.changes = 0
+
+    def extractor_for(self, line: object) -> Optional[_LineExtractor]:
+        """The extractor covering ``line``, or ``None`` when the generic parser must handle it."""
+        if not isinstance(line, dict):
+            return None
+        extractor = self.extractor
+        if extractor is not None and line.keys() <= extractor.shape:
+            return extractor
+        if self.changes >= MAX_LINE_SHAPES:
+            return None
+        self.changes += 1
+        shape = frozenset(line) if extractor is None else extractor.shape.union(line)
+        self.extractor = _line_extractor(shape)
+        return self.extractor
+
+    def parse(
+        self,
+        line: dict,
+        divine_chaos_value: Optional[float],
+        icon_lookup: Dict[str, str],
+        name_lookup: Dict[str, str],
+    ) -> CurrencyEntry:
+        extractor = self.extractor_for(line)
+        if extractor is None:
+            return _parse_currency_line(line, divine_chaos_value, icon_lookup, name_lookup)
+        return extractor.parse(line, divine_chaos_value, icon_lookup, name_lookup)
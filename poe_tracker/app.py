@@ -8,6 +8,21 @@ from typing import Iterable, Optional
 
 import curses
 
+from .api import (
+    DEFAULT_DETAIL_CONCURRENCY,
+    DEFAULT_DETAIL_TTL,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_RATE,
+    MAX_DETAIL_CONCURRENCY,
+    close_traffic,
+    configure_decoding,
+    configure_detail_ttl,
+    configure_rate_limit,
+    configure_traffic,
+    set_base_url,
+)
+from .prefetch import DEFAULT_PREFETCH_BUDGET, MAX_PREFETCH_BUDGET
+from .scheduler import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, DEFAULT_REFRESH_BUDGET
 from .ui import TrackerConfig, TrackerUI
 from .settings import load_settings, save_settings
 
@@ -50,6 +65,64 @@ def build_argument_parser() -> argparse.ArgumentParser:
         default=None,
         help="Refresh interval in seconds (default: value saved in tracker_config.json)",
     )
+    parser.add_argument(
+        "--detail-concurrency",
+        type=int,
+        default=None,
+        help=(
+            "Maximum PoE2 exchange detail requests in flight at once "
+            f"(1-{MAX_DETAIL_CONCURRENCY}, default: value saved in tracker_config.json)"
+        ),
+    )
+    parser.add_argument(
+        "--request-rate",
+        type=float,
+        default=None,
+        help="Maximum sustained PoE Ninja requests per second (default: value saved in tracker_config.json)",
+    )
+    parser.add_argument(
+        "--prefetch-budget",
+        type=int,
+        default=None,
+        help=(
+            "Categories fetched in the background per refresh interval, 0 disables "
+            f"(0-{MAX_PREFETCH_BUDGET}, default: value saved in tracker_config.json)"
+        ),
+    )
+    parser.add_argument(
+        "--lazy-details",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help=(
+            "Load PoE2 exchange details only for the selected row and its neighbours "
+            "(default: value saved in tracker_config.json)"
+        ),
+    )
+    parser.add_argument(
+        "--base-url",
+        default=os.getenv("POE_NINJA_BASE_URL"),
+        help="Send API requests to another host, e.g. a local stand-in server (env: POE_NINJA_BASE_URL)",
+    )
+    traffic = parser.add_mutually_exclusive_group()
+    traffic.add_argument(
+        "--record",
+        metavar="PATH",
+        default=None,
+        help="Write every PoE Ninja request/response to a gzip archive at PATH",
+    )
+    traffic.add_argument(
+        "--replay",
+        metavar="PATH",
+        default=None,
+        help="Serve every request from an archive written by --record instead of the live site",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Delay added to each replayed response (default: 0)",
+    )
     return parser
 
 
@@ -71,6 +144,22 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> TrackerConfig:
         if args.interval < 60:
             parser.error("--interval must be at least 60 seconds to respect API rate limits")
         settings["interval"] = args.interval
+    if args.detail_concurrency is not None:
+        if not 1 <= args.detail_concurrency <= MAX_DETAIL_CONCURRENCY:
+            parser.error(f"--detail-concurrency must be between 1 and {MAX_DETAIL_CONCURRENCY}")
+        settings["detail_concurrency"] = args.detail_concurrency
+    if args.request_rate is not None:
+        if args.request_rate <= 0:
+            parser.error("--request-rate must be greater than zero")
+        settings["request_rate"] = args.request_rate
+    if args.prefetch_budget is not None:
+        if not 0 <= args.prefetch_budget <= MAX_PREFETCH_BUDGET:
+            parser.error(f"--prefetch-budget must be between 0 and {MAX_PREFETCH_BUDGET}")
+        settings["prefetch_budget"] = args.prefetch_budget
+    if args.lazy_details is not None:
+        settings["lazy_details"] = args.lazy_details
+    if args.replay_latency < 0:
+        parser.error("--replay-latency cannot be negative")
     save_settings(settings)
     game = settings["game"]
     league = settings["league"]
@@ -78,6 +167,17 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> TrackerConfig:
     interval = float(settings["interval"])
     category = settings.get("category", "Currency")
     price_mode = settings.get("price_mode", "stash")
+    detail_concurrency = int(settings.get("detail_concurrency", DEFAULT_DETAIL_CONCURRENCY))
+    request_rate = float(settings.get("request_rate", DEFAULT_REQUEST_RATE))
+    request_burst = int(settings.get("request_burst", DEFAULT_REQUEST_BURST))
+    prefetch_budget = int(settings.get("prefetch_budget", DEFAULT_PREFETCH_BUDGET))
+    min_interval = float(settings.get("min_interval", DEFAULT_MIN_INTERVAL))
+    max_interval = float(settings.get("max_interval", DEFAULT_MAX_INTERVAL))
+    refresh_budget = int(settings.get("refresh_budget", DEFAULT_REFRESH_BUDGET))
+    detail_ttl = float(settings.get("detail_ttl", DEFAULT_DETAIL_TTL))
+    lazy_details = bool(settings.get("lazy_details", False))
+    projected_decoding = bool(settings.get("projected_decoding", True))
+    columnar_cache = bool(settings.get("columnar_cache", True))
     return TrackerConfig(
         league=league,
         category=category,
@@ -86,13 +186,37 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> TrackerConfig:
         refresh_interval=interval,
         poe_ninja_cookie=args.ninja_cookie,
         price_mode=price_mode,
+        detail_concurrency=detail_concurrency,
+        request_rate=request_rate,
+        request_burst=request_burst,
+        prefetch_budget=prefetch_budget,
+        min_interval=min_interval,
+        max_interval=max_interval,
+        refresh_budget=refresh_budget,
+        detail_ttl=detail_ttl,
+        lazy_details=lazy_details,
+        projected_decoding=projected_decoding,
+        columnar_cache=columnar_cache,
+        record_path=args.record,
+        replay_path=args.replay,
+        replay_latency=args.replay_latency,
+        base_url=args.base_url,
         settings=settings,
     )
 
 
 def run_curses_app(config: TrackerConfig) -> None:
-    tracker = TrackerUI(config)
-    curses.wrapper(tracker.run)
+    if config.base_url:
+        set_base_url(config.base_url)
+    configure_rate_limit(config.request_rate, config.request_burst)
+    configure_detail_ttl(config.detail_ttl)
+    configure_decoding(config.projected_decoding)
+    configure_traffic(config.record_path, config.replay_path, config.replay_latency)
+    try:
+        tracker = TrackerUI(config)
+        curses.wrapper(tracker.run)
+    finally:
+        close_traffic()
 
 
 def main(argv: Optional[Iterable[str]] = None) -> int:
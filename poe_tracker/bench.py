@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from . import api, codec
+from .cache import _deserialize_snapshot, _serialize_snapshot
+from .data import ColumnarSnapshot
+from .standin import StandInOptions, currency_overview, item_overview
+
+DEFAULT_ITEMS = 20000
+DEFAULT_REPEAT = 5
+DEFAULT_CATEGORIES = ("BaseType", "SkillGem", "UniqueArmour")
+
+
+def build_item_payload(category: str, items: int, seed: int = 0) -> bytes:
+    """Synthetic ``itemoverview`` body with ``items`` lines, shaped like poe.ninja's."""
+    options = StandInOptions(items=items, seed=seed)
+    return json.dumps(item_overview(options, "Standard", category, 0)).encode("utf-8")
+
+
+def build_currency_lines(items: int, seed: int = 0) -> Tuple[List[dict], List[object]]:
+    """Lines and currency details of a synthetic ``currencyoverview`` with ``items`` lines."""
+    payload = currency_overview(StandInOptions(items=items, seed=seed), "Standard", "Currency", 0)
+    return payload["lines"], api._currency_detail_items(payload)
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(repeat, 1)):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def measure(func: Callable[[], object], repeat: int) -> Tuple[float, int, int]:
+    """Best wall time (seconds), peak traced bytes and bytes still held by the result."""
+    best = best_time(func, repeat)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return best, peak, retained
+
+
+def _with_decoding(projected: bool, func: Callable[[], object]) -> Callable[[], object]:
+    def _run() -> object:
+        api.configure_decoding(projected)
+        return func()
+
+    return _run
+
+
+def decoding_cases(body: bytes, category: str) -> List[Tuple[str, Callable[[], object]]]:
+    def _generic() -> object:
+        return api._parse_snapshot_payload(api._decode_json(body), "Standard", category, "itemoverview")
+
+    def _streamed() -> object:
+        return api._parse_snapshot_stream(body, "Standard", category, "itemoverview")
+
+    return [
+        ("decode", _with_decoding(False, lambda: api._decode_json(body))),
+        ("decode, projected", _with_decoding(True, lambda: api._decode_json(body))),
+        ("decode+parse", _with_decoding(False, _generic)),
+        ("decode+parse, projected", _with_decoding(True, _generic)),
+        ("stream+parse", _streamed),
+    ]
+
+
+def _with_backend(backend: str, func: Callable[[], object]) -> Callable[[], object]:
+    def _run() -> object:
+        codec.BACKEND = backend
+        return func()
+
+    return _run
+
+
+def codec_cases(body: bytes, category: str) -> List[Tuple[str, Callable[[], object]]]:
+    """Decode of the raw payload and encode of a snapshot cache file, per available backend."""
+    snapshot = api._parse_snapshot_stream(body, "Standard", category, "itemoverview")
+    cache_payload = {"bench": {"cached_at": time.time(), "snapshot": _serialize_snapshot(snapshot)}}
+    backends = [codec.STDLIB] + ([codec.ORJSON] if codec._orjson is not None else [])
+    cases: List[Tuple[str, Callable[[], object]]] = []
+    for backend in backends:
+        cases.append((f"loads, {backend}", _with_backend(backend, lambda: codec.loads(body))))
+        cases.append((f"cache dumps, {backend}", _with_backend(backend, lambda: codec.dumps(cache_payload))))
+    return cases
+
+
+def parsing_cases(lines: List[dict], details: List[object]) -> List[Tuple[str, Callable[[], object]]]:
+    """Line-to-entry conversion with the generic parser and with the shape-specialized extractors."""
+    icon_lookup, name_lookup = api._build_detail_maps(details)
+
+    def _generic() -> object:
+        return [api._parse_currency_line(line, None, icon_lookup, name_lookup) for line in lines]
+
+    def _shaped() -> object:
+        return api._parse_currency_lines(lines, None, icon_lookup, name_lookup)
+
+    return [("lines, generic", _generic), ("lines, shaped", _shaped)]
+
+
+def snapshot_cases(body: bytes, category: str) -> List[Tuple[str, Callable[[], object]]]:
+    """Loading a cached snapshot as entry objects and as columns, the way ``SnapshotCache`` does."""
+    snapshot = api._parse_snapshot_stream(body, "Standard", category, "itemoverview")
+    cached = codec.dumps(_serialize_snapshot(snapshot))
+
+    def _objects() -> object:
+        return _deserialize_snapshot(codec.loads(cached))
+
+    def _columnar() -> object:
+        return ColumnarSnapshot.from_snapshot(_deserialize_snapshot(codec.loads(cached)))
+
+    return [("snapshot, objects", _objects), ("snapshot, columnar", _columnar)]
+
+
+def _report(cases: List[Tuple[str, Callable[[], object]]], repeat: int) -> None:
+    print(f"  {'case':<26}{'time ms':>10}{'peak MB':>10}{'held MB':>10}")
+    for label, func in cases:
+        elapsed, peak, retained = measure(func, repeat)
+        print(f"  {label:<26}{elapsed * 1000:>10.1f}{peak / 1e6:>10.1f}{retained / 1e6:>10.1f}")
+
+
+def _report_memory(cases: List[Tuple[str, Callable[[], object]]], rows: int, repeat: int) -> None:
+    print(f"  {'case':<26}{'time ms':>10}{'MB/10k entries':>16}")
+    for label, func in cases:
+        elapsed, _, retained = measure(func, repeat)
+        print(f"  {label:<26}{elapsed * 1000:>10.1f}{retained * 10000 / rows / 1e6:>16.2f}")
+
+
+def _report_rate(cases: List[Tuple[str, Callable[[], object]]], rows: int, repeat: int) -> None:
+    print(f"  {'case':<26}{'time ms':>10}{'rows/s':>12}")
+    for label, func in cases:
+        elapsed = best_time(func, repeat)
+        print(f"  {label:<26}{elapsed * 1000:>10.1f}{rows / elapsed:>12,.0f}")
+
+
+def run(categories: List[str], items: int, repeat: int) -> None:
+    previous = (api._PROJECTED_DECODING, codec.BACKEND)
+    try:
+        codec.BACKEND = codec.STDLIB
+        for category in categories:
+            body = build_item_payload(category, items)
+            print(f"{category}: {items} lines, {len(body) / 1e6:.1f} MB (active JSON backend: {previous[1]})")
+            _report(decoding_cases(body, category), repeat)
+            _report(codec_cases(body, category), repeat)
+            payload = json.loads(body)
+            _report_rate(parsing_cases(payload["lines"], api._currency_detail_items(payload)), items, repeat)
+            _report_memory(snapshot_cases(body, category), items, repeat)
+            codec.BACKEND = codec.STDLIB
+        lines, details = build_currency_lines(items)
+        print(f"Currency: {len(lines)} currencyoverview lines")
+        _report_rate(parsing_cases(lines, details), len(lines), repeat)
+    finally:
+        api.configure_decoding(previous[0])
+        codec.BACKEND = previous[1]
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m poe_tracker.bench",
+        description=(
+            "Time and memory of decoding, parsing and serializing large synthetic "
+            "poe.ninja item overviews with each available JSON backend, the rows "
+            "per second of the generic and shape-specialized line parsers, and the "
+            "memory held by cached snapshots as entry objects and as columns."
+        ),
+    )
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS, help="Lines per payload")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="Timed runs per case (best is reported)")
+    parser.add_argument(
+        "--category",
+        action="append",
+        default=None,
+        metavar="NAME",
+        help="Item category to generate (repeatable, default: BaseType, SkillGem, UniqueArmour)",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_argument_parser().parse_args(argv)
+    run(args.category or list(DEFAULT_CATEGORIES), max(args.items, 1), args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
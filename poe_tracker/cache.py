@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import threading
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, Iterator, List, Optional, Tuple
 
-from .data import CurrencyEntry, CurrencySnapshot
+from . import codec
+from .data import AnySnapshot, ColumnarSnapshot, CurrencyEntry, CurrencySnapshot
 
 CACHE_DIR = Path(__file__).resolve().parent.parent / ".cache"
 CACHE_FILE = CACHE_DIR / "snapshots.json"
 DEFAULT_CACHE_TTL = 3600.0  # one hour
+SAVE_DELAY = 2.0  # seconds a deferred write waits, so a burst of updates is written once
 CACHE_VERSION = 3
+RESOLUTION_FILE = CACHE_DIR / "resolution.json"
+RESOLUTION_VERSION = 1
+DEFAULT_NEGATIVE_TTL = 1800.0  # 404/empty endpoint variants are retried after 30 minutes
+RESPONSE_DIR = CACHE_DIR / "responses"
+RESPONSE_INDEX_VERSION = 1
+DEFAULT_RESPONSE_CACHE_BYTES = 128 * 1024 * 1024
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` so a reader never sees a partly written file; raises OSError."""
+    temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
 
 
 def _serialize_entry(entry: CurrencyEntry) -> dict:
@@ -41,7 +60,7 @@ def _deserialize_entry(data: dict) -> CurrencyEntry:
     )
 
 
-def _serialize_snapshot(snapshot: CurrencySnapshot) -> dict:
+def _serialize_snapshot(snapshot: AnySnapshot) -> dict:
     return {
         "league": snapshot.league,
         "entries": [_serialize_entry(entry) for entry in snapshot.entries],
@@ -72,23 +91,43 @@ def _deserialize_snapshot(data: dict) -> Optional[CurrencySnapshot]:
 
 
 class SnapshotCache:
-    """Persisted cache of currency snapshots keyed by normalized category."""
+    """Persisted cache of currency snapshots keyed by normalized category.
+
+    Safe to share between the UI and the background prefetcher. With
+    ``columnar`` the snapshots are held as :class:`ColumnarSnapshot`. Writes
+    to disk happen outside the lock, so readers never wait for one. Without
+    ``persistent`` the cache lives in memory only and never touches the file.
+    """
 
-    def __init__(self, ttl: float = DEFAULT_CACHE_TTL) -> None:
+    def __init__(self, ttl: float = DEFAULT_CACHE_TTL, columnar: bool = False, persistent: bool = True) -> None:
         self.ttl = max(ttl, 0.0)
-        self._entries: Dict[str, Tuple[CurrencySnapshot, float]] = {}
+        self.columnar = columnar
+        self.persistent = persistent
+        self._entries: Dict[str, Tuple[AnySnapshot, float]] = {}
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
         self._load()
 
     @staticmethod
     def _normalize_key(key: str) -> str:
         return key.strip().lower()
 
+    def _stored_form(self, snapshot: AnySnapshot) -> AnySnapshot:
+        if not self.columnar or isinstance(snapshot, ColumnarSnapshot):
+            return snapshot
+        try:
+            return ColumnarSnapshot.from_snapshot(snapshot)
+        except (TypeError, OverflowError):
+            # Values the columns cannot hold (e.g. from a hand-edited cache file) keep the object form.
+            return snapshot
+
     def _load(self) -> None:
-        if not CACHE_FILE.exists():
+        if not self.persistent or not CACHE_FILE.exists():
             return
         try:
-            with CACHE_FILE.open("r", encoding="utf-8") as handle:
-                payload = json.load(handle)
+            payload = codec.loads(CACHE_FILE.read_bytes())
         except (OSError, json.JSONDecodeError):
             return
         if not isinstance(payload, dict):
@@ -111,50 +150,372 @@ class SnapshotCache:
                 continue
             if self.ttl and (now - cached_at) >= self.ttl:
                 continue
-            self._entries[normalized_key] = (snapshot, cached_at)
+            self._entries[normalized_key] = (self._stored_form(snapshot), cached_at)
 
     def _save(self) -> None:
-        try:
-            CACHE_DIR.mkdir(parents=True, exist_ok=True)
-        except OSError:
-            return
-        payload: Dict[str, dict] = {}
-        for key, (snapshot, cached_at) in self._entries.items():
-            payload[key] = {
-                "cached_at": cached_at,
-                "snapshot": _serialize_snapshot(snapshot),
-            }
-        payload["__version__"] = CACHE_VERSION
-        try:
-            with CACHE_FILE.open("w", encoding="utf-8") as handle:
-                json.dump(payload, handle)
-        except OSError:
+        if not self.persistent:
             return
+        # One writer at a time, and each takes its copy after the previous one finished,
+        # so the file always ends up with the newest contents.
+        with self._write_lock:
+            with self._lock:
+                entries = list(self._entries.items())
+                self._dirty = False
+            payload: Dict[str, dict] = {}
+            for key, (snapshot, cached_at) in entries:
+                payload[key] = {
+                    "cached_at": cached_at,
+                    "snapshot": _serialize_snapshot(snapshot),
+                }
+            payload["__version__"] = CACHE_VERSION
+            try:
+                CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                _write_atomic(CACHE_FILE, codec.dumps(payload))
+            except OSError:
+                return
 
-    def get(self, key: str) -> Optional[CurrencySnapshot]:
+    def get(self, key: str) -> Optional[AnySnapshot]:
         normalized = self._normalize_key(key)
-        entry = self._entries.get(normalized)
-        if not entry:
-            return None
-        snapshot, cached_at = entry
-        if self.ttl and (time.time() - cached_at) >= self.ttl:
-            self.remove(normalized)
-            return None
-        return snapshot
+        with self._lock:
+            entry = self._entries.get(normalized)
+            if not entry:
+                return None
+            snapshot, cached_at = entry
+            if self.ttl and (time.time() - cached_at) >= self.ttl:
+                # Expired entries are skipped on load too, so dropping one needs no write.
+                self._entries.pop(normalized, None)
+                self._dirty = True
+                return None
+            return snapshot
 
-    def set(self, key: str, snapshot: CurrencySnapshot) -> None:
+    def set(self, key: str, snapshot: AnySnapshot, persist: bool = True) -> AnySnapshot:
+        """Store ``snapshot`` and return the stored form, which later in-place updates should target.
+
+        With ``persist=False`` nothing is written; call :meth:`persist_later`
+        or :meth:`flush` once a batch of updates is done.
+        """
         normalized = self._normalize_key(key)
-        self._entries[normalized] = (snapshot, time.time())
-        self._save()
+        stored = self._stored_form(snapshot)
+        with self._lock:
+            self._entries[normalized] = (stored, time.time())
+            self._dirty = True
+        if persist:
+            self._save()
+        return stored
+
+    def persist_later(self) -> None:
+        """Write the cache out on a background timer ``SAVE_DELAY`` seconds from now.
 
-    def items(self) -> Iterator[tuple[str, CurrencySnapshot]]:
-        for key in list(self._entries.keys()):
+        Also for snapshots held in the cache that were updated in place; further
+        updates before then are written by the same save.
+        """
+        with self._lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                return
+            timer = threading.Timer(SAVE_DELAY, self._deferred_save)
+            timer.daemon = True
+            self._save_timer = timer
+        timer.start()
+
+    def _deferred_save(self) -> None:
+        with self._lock:
+            self._save_timer = None
+        self.flush()
+
+    def flush(self) -> None:
+        """Write pending changes now (cancels a scheduled write); a no-op when nothing changed."""
+        with self._lock:
+            timer, self._save_timer = self._save_timer, None
+            dirty = self._dirty
+        if timer is not None:
+            timer.cancel()
+        if dirty:
+            self._save()
+
+    def items(self) -> Iterator[tuple[str, AnySnapshot]]:
+        with self._lock:
+            keys = list(self._entries.keys())
+        for key in keys:
             snapshot = self.get(key)
             if snapshot is not None:
                 yield key, snapshot
 
-    def remove(self, key: str) -> None:
+    def remove(self, key: str, persist: bool = True) -> None:
+        """Drop ``key``; with ``persist=False`` the removal is written by a later save."""
         normalized = self._normalize_key(key)
-        if normalized in self._entries:
-            self._entries.pop(normalized, None)
+        with self._lock:
+            removed = self._entries.pop(normalized, None) is not None
+            if removed:
+                self._dirty = True
+        if removed and persist:
             self._save()
+
+
+class ResolutionMemo:
+    """Persisted record of which endpoint variants answer for a (game, league, category).
+
+    Besides the known-good variant per slot it keeps a negative cache of URLs
+    that returned 404 or no data, so steady-state refreshes can skip them until
+    the negative entry expires. With ``path=None`` nothing is read or written.
+    """
+
+    def __init__(self, path: Optional[Path] = RESOLUTION_FILE, negative_ttl: float = DEFAULT_NEGATIVE_TTL) -> None:
+        self.path = path
+        self.negative_ttl = max(negative_ttl, 0.0)
+        self._preferred: Dict[str, Dict[str, str]] = {}
+        self._negative: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self.stats: Dict[str, int] = {"resolution_hits": 0, "negative_skips": 0}
+        self._load()
+
+    @staticmethod
+    def make_key(game: str, league: str, category: str) -> str:
+        return "|".join(part.strip().lower() for part in (game, league, category))
+
+    def preferred(self, key: str, slot: str) -> Optional[str]:
+        with self._lock:
+            value = self._preferred.get(key, {}).get(slot)
+            if value is not None:
+                self.stats["resolution_hits"] += 1
+        return value
+
+    def remember(self, key: str, slot: str, value: str) -> None:
+        with self._lock:
+            slots = self._preferred.setdefault(key, {})
+            if slots.get(slot) != value:
+                slots[slot] = value
+                self._dirty = True
+
+    def is_negative(self, url: str) -> bool:
+        with self._lock:
+            expires_at = self._negative.get(url)
+            if expires_at is None:
+                return False
+            if expires_at <= time.time():
+                self._negative.pop(url, None)
+                self._dirty = True
+                return False
+            self.stats["negative_skips"] += 1
+            return True
+
+    def mark_negative(self, url: str) -> None:
+        if not self.negative_ttl:
+            return
+        with self._lock:
+            self._negative[url] = time.time() + self.negative_ttl
+            self._dirty = True
+
+    def flush(self) -> None:
+        # Flushes run one at a time, so an older payload never lands after a newer one.
+        if self.path is None:
+            return
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                now = time.time()
+                payload = {
+                    "__version__": RESOLUTION_VERSION,
+                    "preferred": {key: dict(slots) for key, slots in self._preferred.items()},
+                    "negative": {url: expires for url, expires in self._negative.items() if expires > now},
+                }
+                self._dirty = False
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                _write_atomic(self.path, json.dumps(payload).encode("utf-8"))
+            except OSError:
+                return
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return
+        if not isinstance(payload, dict) or payload.get("__version__") != RESOLUTION_VERSION:
+            return
+        preferred = payload.get("preferred")
+        if isinstance(preferred, dict):
+            for key, slots in preferred.items():
+                if isinstance(slots, dict):
+                    self._preferred[key] = {
+                        str(slot): str(value) for slot, value in slots.items() if isinstance(value, str)
+                    }
+        negative = payload.get("negative")
+        if isinstance(negative, dict):
+            now = time.time()
+            for url, expires_at in negative.items():
+                if isinstance(expires_at, (int, float)) and expires_at > now:
+                    self._negative[url] = float(expires_at)
+
+
+class ResponseCache:
+    """Raw HTTP response bodies on disk, keyed by request, with a TTL per entry.
+
+    Bodies live in one file each under ``directory``; ``index.json`` keeps the
+    expiry and size of every entry in least-recently-used order. Keys are
+    hashed before they touch the disk so cookies never end up in the index.
+    With ``directory=None`` the cache is disabled: nothing is stored or read.
+    """
+
+    def __init__(self, directory: Optional[Path] = RESPONSE_DIR, max_bytes: int = DEFAULT_RESPONSE_CACHE_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max(max_bytes, 0) if directory is not None else 0
+        self._index: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._stats: Dict[str, int] = {"response_cache_hits": 0, "response_cache_misses": 0}
+        self._load()
+
+    @staticmethod
+    def _digest(key: str) -> str:
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _body_path(self, digest: str) -> Path:
+        return self.directory / f"{digest}.body"
+
+    def get(self, key: str) -> Optional[bytes]:
+        digest = self._digest(key)
+        with self._lock:
+            entry = self._index.get(digest)
+            if entry is None:
+                self._stats["response_cache_misses"] += 1
+                return None
+            if entry[0] <= time.time():
+                self._discard(digest)
+                self._stats["response_cache_misses"] += 1
+                return None
+            self._index.move_to_end(digest)
+            self._dirty = True
+        try:
+            body = self._body_path(digest).read_bytes()
+        except OSError:
+            with self._lock:
+                self._discard(digest)
+                self._stats["response_cache_misses"] += 1
+            return None
+        with self._lock:
+            self._stats["response_cache_hits"] += 1
+        return body
+
+    def put(self, key: str, body: bytes, ttl: float) -> None:
+        if self.directory is None or ttl <= 0 or len(body) > self.max_bytes:
+            return
+        digest = self._digest(key)
+        path = self._body_path(digest)
+        temp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(body)
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            previous = self._index.pop(digest, None)
+            if previous is not None:
+                self._size -= previous[1]
+            self._index[digest] = (time.time() + ttl, len(body))
+            self._size += len(body)
+            self._dirty = True
+            while self._size > self.max_bytes and self._index:
+                self._discard(next(iter(self._index)))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["response_cache_entries"] = len(self._index)
+            snapshot["response_cache_bytes"] = self._size
+        return snapshot
+
+    def flush(self) -> None:
+        if self.directory is None:
+            return
+        # Flushes run one at a time, so an older index never lands after a newer one.
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                payload = {
+                    "__version__": RESPONSE_INDEX_VERSION,
+                    "entries": [[digest, expires_at, size] for digest, (expires_at, size) in self._index.items()],
+                }
+                self._dirty = False
+            try:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                _write_atomic(self.directory / "index.json", json.dumps(payload).encode("utf-8"))
+            except OSError:
+                return
+
+    def _discard(self, digest: str) -> None:
+        entry = self._index.pop(digest, None)
+        if entry is None:
+            return
+        self._size -= entry[1]
+        self._dirty = True
+        try:
+            self._body_path(digest).unlink()
+        except OSError:
+            pass
+
+    def _load(self) -> None:
+        if self.directory is None:
+            return
+        self._read_index()
+        self._sweep_orphans()
+        while self._size > self.max_bytes and self._index:
+            self._discard(next(iter(self._index)))
+
+    def _sweep_orphans(self) -> None:
+        # Bodies the index does not list (left by an unreadable index or an interrupted write)
+        # would otherwise never be evicted and escape ``max_bytes``.
+        try:
+            paths = list(self.directory.iterdir())
+        except OSError:
+            return
+        for path in paths:
+            if path.suffix == ".tmp" or (path.suffix == ".body" and path.stem not in self._index):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def _read_index(self) -> None:
+        index_path = self.directory / "index.json"
+        if not index_path.exists():
+            return
+        try:
+            with index_path.open("r", encoding="utf-8") as handle:
+                payload = json.load(handle)
+        except (OSError, json.JSONDecodeError):
+            return
+        if not isinstance(payload, dict) or payload.get("__version__") != RESPONSE_INDEX_VERSION:
+            return
+        entries = payload.get("entries")
+        if not isinstance(entries, list):
+            return
+        now = time.time()
+        for item in entries:
+            if not (isinstance(item, list) and len(item) == 3):
+                continue
+            digest, expires_at, size = item
+            if not isinstance(digest, str) or not isinstance(expires_at, (int, float)) or not isinstance(size, int):
+                continue
+            if expires_at <= now:
+                try:
+                    self._body_path(digest).unlink()
+                except OSError:
+                    pass
+                self._dirty = True
+                continue
+            if not self._body_path(digest).exists():
+                self._dirty = True
+                continue
+            self._index[digest] = (float(expires_at), size)
+            self._size += size
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Union
+
+# "stdlib" forces the standard library even when a faster backend is installed.
+CODEC_ENV = "POE_TRACKER_JSON"
+STDLIB = "stdlib"
+ORJSON = "orjson"
+
+try:
+    import orjson as _orjson
+except ImportError:  # optional, installed with the "fast" extra
+    _orjson = None
+
+
+def _select_backend() -> str:
+    requested = os.getenv(CODEC_ENV, "").strip().lower()
+    if requested in (STDLIB, "json"):
+        return STDLIB
+    if _orjson is not None:
+        return ORJSON
+    return STDLIB
+
+
+# Chosen once at import time.
+BACKEND = _select_backend()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document; raises ``json.JSONDecodeError`` on malformed input.
+
+    Input the fast backend rejects (a BOM, UTF-16, NaN, or malformed JSON)
+    is handed to the standard library, so results and errors match
+    ``json.loads``. The one difference: the fast backend reads integers
+    beyond 64 bits as floats.
+    """
+    if BACKEND == ORJSON:
+        try:
+            return _orjson.loads(data)
+        except _orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode ``value`` as compact UTF-8 JSON.
+
+    Non-string dict keys are converted like the standard library does. With
+    the fast backend, non-finite floats become ``null``.
+    """
+    if BACKEND == ORJSON:
+        return _orjson.dumps(value, option=_orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
@@ -1,22 +1,27 @@
 from __future__ import annotations
 
+import sys
+from array import array
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass, field
-from typing import List, Optional, Sequence
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
 
+# Stands in for None in the trade count column; NaN does so in the float columns.
+_NO_COUNT = -(2**63)
+_NO_VALUE = float("nan")
+# Share of the sparkline buffer left unused by rewritten series that triggers a compaction.
+SPARK_COMPACT_RATIO = 0.5
 
-@dataclass(slots=True)
-class CurrencyEntry:
-    """Represents a single currency line from the PoE Ninja overview."""
 
-    name: str
+class _Formatting:
+    """Display formatting shared by entries and entry views."""
+
+    __slots__ = ()
+
     chaos_value: float
-    divine_value: Optional[float] = None
-    exalt_value: Optional[float] = None
-    change_percent: Optional[float] = None
-    sparkline: Sequence[float] = field(default_factory=list)
-    trade_count: Optional[int] = None
-    details_id: Optional[str] = None
-    icon_url: Optional[str] = None
+    divine_value: Optional[float]
+    exalt_value: Optional[float]
+    change_percent: Optional[float]
 
     def formatted_change(self) -> str:
         if self.change_percent is None:
@@ -44,6 +49,21 @@ class CurrencyEntry:
         return formatted
 
 
+@dataclass(slots=True)
+class CurrencyEntry(_Formatting):
+    """Represents a single currency line from the PoE Ninja overview."""
+
+    name: str
+    chaos_value: float
+    divine_value: Optional[float] = None
+    exalt_value: Optional[float] = None
+    change_percent: Optional[float] = None
+    sparkline: Sequence[float] = field(default_factory=list)
+    trade_count: Optional[int] = None
+    details_id: Optional[str] = None
+    icon_url: Optional[str] = None
+
+
 @dataclass(slots=True)
 class CurrencySnapshot:
     """A snapshot of the currency overview for a specific league."""
@@ -52,6 +72,243 @@ class CurrencySnapshot:
     entries: List[CurrencyEntry]
     fetched_at: float
     source_type: str
+    # Snapshots for other price modes built from the same fetch, keyed by price mode
+    # (e.g. the stash data downloaded alongside an exchange refresh).
+    companions: Dict[str, "CurrencySnapshot"] = field(default_factory=dict)
+    # Exalted Orb price the exalt values were last derived from, and whether the snapshot
+    # listed that price itself; maintained by the UI so the values are computed once.
+    exalt_basis: Optional[float] = None
+    exalt_basis_listed: bool = False
 
     def top_entries(self, limit: int) -> List[CurrencyEntry]:
         return self.entries[:limit]
+
+    def matching_entries(self, needle: str) -> List[CurrencyEntry]:
+        """Entries whose lower-cased name contains ``needle``."""
+        return [entry for entry in self.entries if needle in entry.name.lower()]
+
+    def apply_exalt_price(self, exalt_price: float) -> None:
+        for entry in self.entries:
+            entry.exalt_value = (entry.chaos_value / exalt_price) if entry.chaos_value else None
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else None
+
+
+def _float_or_missing(value: Optional[float]) -> float:
+    return _NO_VALUE if value is None else value
+
+
+def _text_column(name: str) -> property:
+    def _get(view: EntryView) -> Optional[str]:
+        return getattr(view._snapshot, name)[view._index]
+
+    def _set(view: EntryView, value: Optional[str]) -> None:
+        getattr(view._snapshot, name)[view._index] = _intern(value)
+
+    return property(_get, _set)
+
+
+def _float_column(name: str, optional: bool = True) -> property:
+    def _get(view: EntryView) -> Optional[float]:
+        value = getattr(view._snapshot, name)[view._index]
+        if optional and value != value:
+            return None
+        return value
+
+    def _set(view: EntryView, value: Optional[float]) -> None:
+        getattr(view._snapshot, name)[view._index] = _float_or_missing(value)
+
+    return property(_get, _set)
+
+
+class EntryView(_Formatting):
+    """One row of a :class:`ColumnarSnapshot`, read and written like a :class:`CurrencyEntry`."""
+
+    __slots__ = ("_snapshot", "_index")
+
+    def __init__(self, snapshot: ColumnarSnapshot, index: int) -> None:
+        self._snapshot = snapshot
+        self._index = index
+
+    def __repr__(self) -> str:
+        return f"EntryView({self.name!r}, chaos_value={self.chaos_value!r})"
+
+    name = _text_column("_names")
+    details_id = _text_column("_details_ids")
+    icon_url = _text_column("_icon_urls")
+    chaos_value = _float_column("_chaos", optional=False)
+    divine_value = _float_column("_divine")
+    exalt_value = _float_column("_exalt")
+    change_percent = _float_column("_change")
+
+    @property
+    def trade_count(self) -> Optional[int]:
+        value = self._snapshot._trade_counts[self._index]
+        return None if value == _NO_COUNT else value
+
+    @trade_count.setter
+    def trade_count(self, value: Optional[int]) -> None:
+        self._snapshot._trade_counts[self._index] = _NO_COUNT if value is None else value
+
+    @property
+    def sparkline(self) -> Sequence[float]:
+        snapshot = self._snapshot
+        start = snapshot._spark_starts[self._index]
+        return snapshot._sparks[start : start + snapshot._spark_lengths[self._index]]
+
+    @sparkline.setter
+    def sparkline(self, values: Iterable[float]) -> None:
+        snapshot = self._snapshot
+        index = self._index
+        series = array("d", values)
+        start = snapshot._spark_starts[index]
+        length = snapshot._spark_lengths[index]
+        if len(series) <= length:
+            snapshot._sparks[start : start + len(series)] = series
+            freed = length - len(series)
+        else:
+            # A longer series no longer fits its slot and moves to the end of the buffer.
+            snapshot._spark_starts[index] = len(snapshot._sparks)
+            snapshot._sparks.extend(series)
+            freed = length
+        snapshot._spark_lengths[index] = len(series)
+        snapshot._free_sparks(freed)
+
+
+class _EntryViews(SequenceABC):
+    __slots__ = ("_snapshot",)
+
+    def __init__(self, snapshot: ColumnarSnapshot) -> None:
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return len(self._snapshot._names)
+
+    def __iter__(self) -> Iterator[EntryView]:
+        snapshot = self._snapshot
+        return (EntryView(snapshot, index) for index in range(len(self)))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[EntryView, List[EntryView]]:
+        count = len(self)
+        if isinstance(index, slice):
+            return [EntryView(self._snapshot, position) for position in range(*index.indices(count))]
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("entry index out of range")
+        return EntryView(self._snapshot, index)
+
+
+class ColumnarSnapshot:
+    """Array-backed :class:`CurrencySnapshot` for snapshots held in memory for a long time.
+
+    Each field is one column: interned strings for names and ids, ``array``
+    columns for the numbers (NaN, or the smallest 64-bit integer for trade
+    counts, stands in for ``None``), and one float buffer with per-entry
+    offsets for all sparklines, compacted once rewritten series leave more
+    than ``SPARK_COMPACT_RATIO`` of it unused. ``entries`` yields
+    :class:`EntryView` rows that read and write through to the columns, so
+    code written against ``CurrencyEntry`` works unchanged. A NaN stored in
+    an optional column reads back as ``None``. Companion snapshots are not
+    carried over.
+    """
+
+    __slots__ = (
+        "league",
+        "fetched_at",
+        "source_type",
+        "companions",
+        "exalt_basis",
+        "exalt_basis_listed",
+        "_names",
+        "_details_ids",
+        "_icon_urls",
+        "_chaos",
+        "_divine",
+        "_exalt",
+        "_change",
+        "_trade_counts",
+        "_spark_starts",
+        "_spark_lengths",
+        "_sparks",
+        "_spark_dead",
+    )
+
+    def __init__(self, league: str, entries: Iterable[CurrencyEntry], fetched_at: float, source_type: str) -> None:
+        """Copy ``entries`` into columns; raises ``TypeError`` or ``OverflowError`` for values the columns cannot hold."""
+        self.league = league
+        self.fetched_at = fetched_at
+        self.source_type = source_type
+        self.companions: Dict[str, CurrencySnapshot] = {}
+        self.exalt_basis: Optional[float] = None
+        self.exalt_basis_listed = False
+        self._names: List[str] = []
+        self._details_ids: List[Optional[str]] = []
+        self._icon_urls: List[Optional[str]] = []
+        self._chaos = array("d")
+        self._divine = array("d")
+        self._exalt = array("d")
+        self._change = array("d")
+        self._trade_counts = array("q")
+        self._spark_starts = array("q")
+        self._spark_lengths = array("I")
+        self._sparks = array("d")
+        self._spark_dead = 0
+        for entry in entries:
+            self._append(entry)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: CurrencySnapshot) -> ColumnarSnapshot:
+        columnar = cls(snapshot.league, snapshot.entries, snapshot.fetched_at, snapshot.source_type)
+        columnar.exalt_basis = snapshot.exalt_basis
+        columnar.exalt_basis_listed = snapshot.exalt_basis_listed
+        return columnar
+
+    def _append(self, entry: CurrencyEntry) -> None:
+        self._chaos.append(entry.chaos_value)
+        self._divine.append(_float_or_missing(entry.divine_value))
+        self._exalt.append(_float_or_missing(entry.exalt_value))
+        self._change.append(_float_or_missing(entry.change_percent))
+        self._trade_counts.append(_NO_COUNT if entry.trade_count is None else entry.trade_count)
+        self._spark_starts.append(len(self._sparks))
+        self._sparks.extend(entry.sparkline)
+        self._spark_lengths.append(len(self._sparks) - self._spark_starts[-1])
+        self._names.append(sys.intern(str(entry.name)))
+        self._details_ids.append(_intern(entry.details_id))
+        self._icon_urls.append(_intern(entry.icon_url))
+
+    def _free_sparks(self, count: int) -> None:
+        self._spark_dead += count
+        if self._spark_dead and self._spark_dead > len(self._sparks) * SPARK_COMPACT_RATIO:
+            self._compact_sparks()
+
+    def _compact_sparks(self) -> None:
+        # Copy the live series into a fresh buffer in row order; the arrays are swapped in whole.
+        sparks = array("d")
+        starts = array("q")
+        previous = self._sparks
+        for start, length in zip(self._spark_starts, self._spark_lengths):
+            starts.append(len(sparks))
+            sparks.extend(previous[start : start + length])
+        self._sparks = sparks
+        self._spark_starts = starts
+        self._spark_dead = 0
+
+    @property
+    def entries(self) -> Sequence[EntryView]:
+        return _EntryViews(self)
+
+    def top_entries(self, limit: int) -> List[EntryView]:
+        return self.entries[:limit]
+
+    def matching_entries(self, needle: str) -> List[EntryView]:
+        """Views of the rows whose lower-cased name contains ``needle``, scanning only the name column."""
+        return [EntryView(self, index) for index, name in enumerate(self._names) if needle in name.lower()]
+
+    def apply_exalt_price(self, exalt_price: float) -> None:
+        self._exalt = array("d", ((chaos / exalt_price) if chaos else _NO_VALUE for chaos in self._chaos))
+
+
+AnySnapshot = Union[CurrencySnapshot, ColumnarSnapshot]
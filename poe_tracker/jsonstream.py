@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Callable, Container, Dict, Generator, Iterable, Iterator, List, Optional, Tuple
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Decodes the value of a member starting at ``index``; returns ``(value, end_index)``.
+MemberDecoder = Callable[[str, str, int], Tuple[object, int]]
+
+
+def decode_body(body: bytes) -> str:
+    """Decode a JSON response body the same way ``json.loads`` does for bytes."""
+    return body.decode(json.detect_encoding(body), "surrogatepass")
+
+
+def _skip(text: str, index: int) -> int:
+    return _WHITESPACE.match(text, index).end()
+
+
+def _plain_member(key: str, text: str, index: int) -> Tuple[object, int]:
+    return _DECODER.raw_decode(text, index)
+
+
+def is_object(text: str) -> bool:
+    """Whether the JSON document in ``text`` is an object (checks the first token only)."""
+    return text.startswith("{", _skip(text, 0))
+
+
+def _members(
+    text: str,
+    index: int,
+    stream_keys: Container[str],
+    element_decoder: json.JSONDecoder,
+    member_decoder: MemberDecoder,
+) -> Generator[Tuple[str, object, bool], None, int]:
+    # ``index`` points at the opening brace; the generator returns the index after the closing one.
+    streamed = set()
+    index = _skip(text, index + 1)
+    if text.startswith("}", index):
+        return index + 1
+    while True:
+        if not text.startswith('"', index):
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, index)
+        key, index = _DECODER.raw_decode(text, index)
+        index = _skip(text, index)
+        if not text.startswith(":", index):
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, index)
+        index = _skip(text, index + 1)
+        if key in stream_keys and key not in streamed and text.startswith("[", index):
+            streamed.add(key)
+            index = _skip(text, index + 1)
+            if text.startswith("]", index):
+                index += 1
+            else:
+                while True:
+                    element, index = element_decoder.raw_decode(text, index)
+                    yield key, element, True
+                    index = _skip(text, index)
+                    if text.startswith(",", index):
+                        index = _skip(text, index + 1)
+                        continue
+                    if text.startswith("]", index):
+                        index += 1
+                        break
+                    raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+        else:
+            value, index = member_decoder(key, text, index)
+            yield key, value, False
+        index = _skip(text, index)
+        if text.startswith(",", index):
+            index = _skip(text, index + 1)
+            continue
+        if text.startswith("}", index):
+            return index + 1
+        raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+
+
+def _expect_end(text: str, index: int) -> None:
+    index = _skip(text, index)
+    if index != len(text):
+        raise json.JSONDecodeError("Extra data", text, index)
+
+
+def iter_members(
+    text: str,
+    stream_keys: Container[str],
+    element_decoder: Optional[json.JSONDecoder] = None,
+) -> Iterator[Tuple[str, object, bool]]:
+    """Walk the members of the top-level JSON object in ``text`` in document order.
+
+    Yields ``(key, value, False)`` for ordinary members. A member named in
+    ``stream_keys`` whose value is an array is not decoded as a whole; instead
+    each element is decoded with ``element_decoder`` (plain JSON by default)
+    and yielded as ``(key, element, True)``, so only one element is held at a
+    time. Only the first occurrence of a key is streamed; repeats are yielded
+    as ordinary members. Malformed input raises ``json.JSONDecodeError`` like
+    ``json.loads``.
+    """
+    index = _skip(text, 0)
+    if not text.startswith("{", index):
+        raise json.JSONDecodeError("Expecting '{'", text, index)
+    index = yield from _members(text, index, stream_keys, element_decoder or _DECODER, _plain_member)
+    _expect_end(text, index)
+
+
+class FieldProjector:
+    """Decodes poe.ninja documents keeping only the record fields the parsers read.
+
+    Objects inside the arrays named in ``record_keys`` (at the top level or
+    inside a ``wrapper_keys`` object) keep only members named in ``fields``;
+    the dropped values are released as soon as their record is decoded.
+    Everything else, including maps keyed by item ids, is decoded as usual.
+    An object whose members are all dropped keeps one key mapped to ``None``
+    so ``a or b`` fallbacks in the parsers see the same truthiness.
+    """
+
+    def __init__(self, fields: Iterable[str], record_keys: Iterable[str], wrapper_keys: Iterable[str] = ()) -> None:
+        self.fields = frozenset(fields)
+        self.record_keys = frozenset(record_keys)
+        self.wrapper_keys = frozenset(wrapper_keys)
+        self.record_decoder = json.JSONDecoder(object_pairs_hook=self._project)
+
+    def _project(self, pairs: List[Tuple[str, object]]) -> Dict[str, object]:
+        fields = self.fields
+        projected = {key: value for key, value in pairs if key in fields}
+        if not projected and pairs:
+            projected[pairs[0][0]] = None
+        return projected
+
+    def loads(self, body: bytes) -> object:
+        text = decode_body(body)
+        index = _skip(text, 0)
+        if not text.startswith("{", index):
+            return json.loads(text)
+        value, index = self._decode_object(text, index)
+        _expect_end(text, index)
+        return value
+
+    def _decode_member(self, key: str, text: str, index: int) -> Tuple[object, int]:
+        if key in self.record_keys and text.startswith("[", index):
+            return self.record_decoder.raw_decode(text, index)
+        if key in self.wrapper_keys and text.startswith("{", index):
+            return self._decode_object(text, index)
+        return _DECODER.raw_decode(text, index)
+
+    def _decode_object(self, text: str, index: int) -> Tuple[Dict[str, object], int]:
+        result: Dict[str, object] = {}
+        members = _members(text, index, (), _DECODER, self._decode_member)
+        while True:
+            try:
+                key, value, _ = next(members)
+            except StopIteration as stop:
+                return result, stop.value
+            result[key] = value
@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+import http.client
+import threading
+import time
+import urllib.parse
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Mapping, Optional, Tuple, TypeVar
+
+MAX_IDLE_PER_HOST = 8
+MAX_REDIRECTS = 5
+READ_CHUNK_SIZE = 64 * 1024
+ACCEPT_ENCODING = "gzip, deflate"
+
+_REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+# Errors that indicate a kept-alive socket was closed by the server while idle.
+_STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    http.client.BadStatusLine,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+_HostKey = Tuple[str, str, int]
+_T = TypeVar("_T")
+
+
+class _DeflateDecoder:
+    """Decoder for ``Content-Encoding: deflate``.
+
+    Servers disagree on whether deflate means a zlib stream or a raw deflate
+    stream, so the first chunk decides which one is in use.
+    """
+
+    def __init__(self) -> None:
+        self._decoder = zlib.decompressobj(zlib.MAX_WBITS)
+        self._started = False
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._started:
+            return self._decoder.decompress(data)
+        self._started = True
+        try:
+            return self._decoder.decompress(data)
+        except zlib.error:
+            self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+            return self._decoder.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._decoder.flush()
+
+
+def _make_decoder(content_encoding: str):
+    encoding = content_encoding.strip().lower()
+    if encoding in {"", "identity"}:
+        return None
+    if encoding in {"gzip", "x-gzip"}:
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if encoding == "deflate":
+        return _DeflateDecoder()
+    raise TransportError(f"Unsupported content encoding: {content_encoding}")
+
+
+class TransportError(Exception):
+    """Raised when an HTTP request cannot be completed."""
+
+
+class HTTPStatusError(TransportError):
+    """Raised when the server answers with an error status code."""
+
+    def __init__(self, url: str, status: int, reason: str, headers: Optional[Dict[str, str]] = None) -> None:
+        super().__init__(f"HTTP Error {status}: {reason}")
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers or {}
+
+
+@dataclass(slots=True)
+class HttpResponse:
+    """A fully read HTTP response."""
+
+    url: str
+    status: int
+    reason: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+
+class ConnectionPool:
+    """Thread-safe pool of keep-alive connections grouped per scheme, host and port."""
+
+    def __init__(self, max_idle_per_host: int = MAX_IDLE_PER_HOST) -> None:
+        self.max_idle_per_host = max(max_idle_per_host, 0)
+        self._idle: Dict[_HostKey, List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "connections_new": 0,
+            "connections_reused": 0,
+            "connections_discarded": 0,
+            "requests": 0,
+            "bytes_wire": 0,
+            "bytes_decoded": 0,
+        }
+
+    def request(self, url: str, headers: Mapping[str, str], timeout: float) -> HttpResponse:
+        current_url = url
+        for _ in range(MAX_REDIRECTS + 1):
+            response = self._send(current_url, headers, timeout)
+            location = response.headers.get("location")
+            if response.status in _REDIRECT_STATUSES and location:
+                current_url = urllib.parse.urljoin(current_url, location)
+                continue
+            if response.status >= 400:
+                raise HTTPStatusError(current_url, response.status, response.reason, response.headers)
+            return response
+        raise TransportError(f"Too many redirects while fetching {url}")
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["connections_idle"] = sum(len(conns) for conns in self._idle.values())
+        return snapshot
+
+    def close(self) -> None:
+        with self._lock:
+            idle = [conn for conns in self._idle.values() for conn in conns]
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+    def _send(self, url: str, headers: Mapping[str, str], timeout: float) -> HttpResponse:
+        parts = urllib.parse.urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in {"http", "https"} or not parts.hostname:
+            raise TransportError(f"Unsupported URL: {url}")
+        default_port = 443 if scheme == "https" else 80
+        key: _HostKey = (scheme, parts.hostname, parts.port or default_port)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        request_headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        request_headers.update(headers)
+
+        conn, reused = self._acquire(key, timeout)
+        while True:
+            try:
+                conn.request("GET", target, headers=request_headers)
+                raw = conn.getresponse()
+                body, wire_bytes = self._read_body(raw)
+            except _STALE_CONNECTION_ERRORS as exc:
+                conn.close()
+                if not reused:
+                    raise TransportError(str(exc) or exc.__class__.__name__) from exc
+                # A reused socket went stale between refreshes; GET is safe to replay once.
+                self._count("connections_discarded")
+                conn, reused = self._connect(key, timeout), False
+                continue
+            except (OSError, http.client.HTTPException, zlib.error) as exc:
+                conn.close()
+                raise TransportError(str(exc) or exc.__class__.__name__) from exc
+            except TransportError:
+                conn.close()
+                raise
+            break
+
+        response_headers = {name.lower(): value for name, value in raw.getheaders()}
+        # The body handed to callers is already decoded.
+        response_headers.pop("content-encoding", None)
+        if raw.will_close:
+            conn.close()
+        else:
+            self._release(key, conn)
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["bytes_wire"] += wire_bytes
+            self._stats["bytes_decoded"] += len(body)
+        return HttpResponse(url=url, status=raw.status, reason=raw.reason, headers=response_headers, body=body)
+
+    @staticmethod
+    def _read_body(raw: http.client.HTTPResponse) -> Tuple[bytes, int]:
+        """Read the body chunk by chunk, decompressing as the bytes arrive."""
+        decoder = _make_decoder(raw.getheader("Content-Encoding") or "")
+        chunks: List[bytes] = []
+        wire_bytes = 0
+        while True:
+            chunk = raw.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            wire_bytes += len(chunk)
+            chunks.append(decoder.decompress(chunk) if decoder is not None else chunk)
+        if decoder is not None:
+            chunks.append(decoder.flush())
+        return b"".join(chunks), wire_bytes
+
+    def _acquire(self, key: _HostKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            conn = idle.pop() if idle else None
+            if conn is not None:
+                self._stats["connections_reused"] += 1
+        if conn is None:
+            return self._connect(key, timeout), False
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn, True
+
+    def _connect(self, key: _HostKey, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            conn: http.client.HTTPConnection = http.client.HTTPSConnection(host, port, timeout=timeout)
+        else:
+            conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        self._count("connections_new")
+        return conn
+
+    def _release(self, key: _HostKey, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] = self._stats.get(name, 0) + 1
+
+
+@dataclass(slots=True)
+class _ValidatedBody:
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+
+
+class ConditionalCache:
+    """Remembers ETag/Last-Modified validators and bodies so unchanged URLs can be revalidated."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max(max_bytes, 0)
+        self._entries: "OrderedDict[str, _ValidatedBody]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "conditional_hits": 0,
+            "conditional_misses": 0,
+            "conditional_bytes_saved": 0,
+        }
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return {}
+        headers: Dict[str, str] = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def resolve(self, key: str, response: HttpResponse) -> Optional[HttpResponse]:
+        """Fill in the body of a 304 answer, or remember the validators of a fresh one.
+
+        Returns ``None`` when the server answered 304 but the stored body is gone,
+        in which case the caller should repeat the request without validators.
+        """
+        if response.status == 304:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is None:
+                    return None
+                self._entries.move_to_end(key)
+                self._stats["conditional_hits"] += 1
+                self._stats["conditional_bytes_saved"] += len(entry.body)
+            headers = dict(response.headers)
+            headers.setdefault("content-type", "application/json")
+            return HttpResponse(url=response.url, status=304, reason=response.reason, headers=headers, body=entry.body)
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        with self._lock:
+            self._stats["conditional_misses"] += 1
+            self._discard(key)
+            if (etag or last_modified) and len(response.body) <= self.max_bytes:
+                self._entries[key] = _ValidatedBody(etag, last_modified, response.body)
+                self._size += len(response.body)
+                while self._size > self.max_bytes and self._entries:
+                    self._discard(next(iter(self._entries)))
+        return response
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["conditional_entries"] = len(self._entries)
+        return snapshot
+
+    def _discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry.body)
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of a URL: lower-case scheme/host, sorted query parameters."""
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", query, ""))
+
+
+class SingleFlight:
+    """Collapses concurrent calls that share a key into a single execution.
+
+    The first caller runs the function; callers arriving while it is in flight
+    wait for and receive the same result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._stats: Dict[str, int] = {"singleflight_calls": 0, "singleflight_collapsed": 0}
+
+    def do(self, key: str, func: Callable[[], _T]) -> _T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = Future()
+                self._calls[key] = call
+                self._stats["singleflight_calls"] += 1
+            else:
+                self._stats["singleflight_collapsed"] += 1
+        if not leader:
+            return call.result()
+        try:
+            result = func()
+        except BaseException as exc:
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+
+class CircuitOpenError(TransportError):
+    """Raised instead of sending a request while its circuit breaker is open."""
+
+    def __init__(self, name: str, retry_in: float) -> None:
+        super().__init__(f"{name} unavailable, retrying in {max(retry_in, 0.0):.0f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one family of endpoints.
+
+    After ``failure_threshold`` failures in a row the circuit opens and calls
+    fail fast. Once ``reset_timeout`` seconds have passed a single probe is let
+    through (half-open); its outcome closes the circuit or opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = max(reset_timeout, 0.0)
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._stats: Dict[str, int] = {"opened": 0, "rejected": 0}
+
+    def check(self) -> None:
+        """Raise :class:`CircuitOpenError` unless a request may be sent now."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self._state == self.OPEN and remaining <= 0:
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return
+            self._stats["rejected"] += 1
+        raise CircuitOpenError(self.name, remaining)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    self._stats["opened"] += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def state(self) -> Tuple[str, float]:
+        """Current state and, while open, the seconds until the next probe."""
+        with self._lock:
+            if self._state == self.OPEN:
+                return self._state, max(self._opened_at + self.reset_timeout - time.monotonic(), 0.0)
+            return self._state, 0.0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
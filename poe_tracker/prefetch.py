@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional, Sequence
+
+from .api import ApiError
+from .data import CurrencySnapshot
+
+DEFAULT_PREFETCH_BUDGET = 12  # categories fetched ahead of time per refresh window
+MAX_PREFETCH_BUDGET = 100
+PREFETCH_PAUSE = 0.5  # seconds between background fetches, leaves room for foreground requests
+DETAIL_LOOKAHEAD = 3  # rows above and below the selection whose details are loaded in lazy mode
+
+
+def window_order(count: int, center: int, radius: int = DETAIL_LOOKAHEAD) -> List[int]:
+    """Row indexes within ``radius`` of ``center``: the center first, then alternating below and above."""
+    if count <= 0:
+        return []
+    center = max(0, min(center, count - 1))
+    ordered = [center]
+    for distance in range(1, max(radius, 0) + 1):
+        for index in (center + distance, center - distance):
+            if 0 <= index < count:
+                ordered.append(index)
+    return ordered
+
+
+def neighbour_order(categories: Sequence[str], center: int) -> List[str]:
+    """Return ``categories`` without ``center``, nearest neighbours first (right, then left)."""
+    count = len(categories)
+    if count == 0:
+        return []
+    center %= count
+    ordered: List[str] = []
+    seen = {center}
+    for distance in range(1, count // 2 + 1):
+        for index in ((center + distance) % count, (center - distance) % count):
+            if index not in seen:
+                seen.add(index)
+                ordered.append(categories[index])
+    return ordered
+
+
+class CategoryPrefetcher:
+    """Background worker that warms the snapshot cache for categories not opened yet.
+
+    ``schedule`` (re)plans the queue around the category on screen; the worker
+    then fetches neighbours first and the rest of the cycle afterwards. At most
+    ``budget`` network fetches are made per ``window`` seconds; categories that
+    ``needs_fetch`` reports as already cached are skipped without spending any.
+    While suspended (e.g. during a foreground fetch) no new fetch is started.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Hashable, str], CurrencySnapshot],
+        needs_fetch: Callable[[Hashable, str], bool],
+        store: Callable[[Hashable, str, CurrencySnapshot], None],
+        budget: int = DEFAULT_PREFETCH_BUDGET,
+        window: float = 120.0,
+        pause: float = PREFETCH_PAUSE,
+    ) -> None:
+        self.budget = max(budget, 0)
+        self.window = max(window, 1.0)
+        self.pause = max(pause, 0.0)
+        self._fetch = fetch
+        self._needs_fetch = needs_fetch
+        self._store = store
+        self._cond = threading.Condition()
+        self._queue: List[str] = []
+        self._context: Optional[Hashable] = None
+        self._spent = 0
+        self._window_start = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._suspended = False
+        self._stats: Dict[str, int] = {"prefetched": 0, "prefetch_failed": 0, "prefetch_skipped": 0}
+
+    def schedule(self, context: Hashable, categories: Sequence[str], center: int) -> None:
+        with self._cond:
+            if self._closed or self.budget <= 0:
+                return
+            self._context = context
+            self._queue = neighbour_order(categories, center)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="category-prefetch", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self) -> None:
+        with self._cond:
+            self._queue.clear()
+            self._context = None
+
+    def suspend(self) -> None:
+        with self._cond:
+            self._suspended = True
+
+    def resume(self) -> None:
+        with self._cond:
+            if self._suspended:
+                self._suspended = False
+                self._cond.notify()
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify()
+
+    def _next(self) -> Optional[tuple[Hashable, str]]:
+        with self._cond:
+            while not self._closed:
+                now = time.monotonic()
+                if now - self._window_start >= self.window:
+                    self._window_start = now
+                    self._spent = 0
+                timeout: Optional[float] = None
+                if self._queue and not self._suspended:
+                    if self._spent < self.budget:
+                        return self._context, self._queue.pop(0)
+                    timeout = self._window_start + self.window - now
+                self._cond.wait(timeout)
+        return None
+
+    def _run(self) -> None:
+        while True:
+            task = self._next()
+            if task is None:
+                return
+            context, category = task
+            if not self._needs_fetch(context, category):
+                with self._cond:
+                    self._stats["prefetch_skipped"] += 1
+                continue
+            with self._cond:
+                self._spent += 1
+            try:
+                snapshot = self._fetch(context, category)
+            except ApiError:
+                with self._cond:
+                    self._stats["prefetch_failed"] += 1
+            else:
+                self._store(context, category, snapshot)
+                with self._cond:
+                    self._stats["prefetched"] += 1
+            with self._cond:
+                if not self._closed and self.pause:
+                    self._cond.wait(self.pause)
+
+
+class DetailLoader:
+    """Background worker that loads exchange details for the rows around the selection.
+
+    ``schedule`` replaces the queue, so moving the selection drops ids that are
+    no longer near it. Each loaded detail is handed to ``deliver`` together
+    with the context and id it was requested for.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[Hashable, str], Optional[dict]],
+        deliver: Callable[[Hashable, str, dict], None],
+    ) -> None:
+        self._fetch = fetch
+        self._deliver = deliver
+        self._cond = threading.Condition()
+        self._queue: List[str] = []
+        self._context: Optional[Hashable] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._stats: Dict[str, int] = {"details_loaded": 0, "details_failed": 0}
+
+    def schedule(self, context: Hashable, ids: Sequence[str]) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._context = context
+            self._queue = list(dict.fromkeys(ids))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="detail-loader", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def cancel(self) -> None:
+        with self._cond:
+            self._queue.clear()
+            self._context = None
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def stats(self) -> Dict[str, int]:
+        with self._cond:
+            return dict(self._stats)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify()
+
+    def _next(self) -> Optional[tuple[Hashable, str]]:
+        with self._cond:
+            while not self._closed:
+                if self._queue:
+                    return self._context, self._queue.pop(0)
+                self._cond.wait()
+        return None
+
+    def _run(self) -> None:
+        while True:
+            task = self._next()
+            if task is None:
+                return
+            context, item_id = task
+            try:
+                detail = self._fetch(context, item_id)
+            except ApiError:
+                detail = None
+            with self._cond:
+                self._stats["details_loaded" if detail else "details_failed"] += 1
+            if detail:
+                self._deliver(context, item_id, detail)
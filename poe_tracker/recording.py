@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Mapping, Union
+
+from .net import HttpResponse, normalize_url
+
+ARCHIVE_VERSION = 1
+# Request headers that are never written to an archive.
+_PRIVATE_HEADERS = {"cookie", "authorization"}
+
+
+class ReplayError(Exception):
+    """Raised when an archive cannot be read or has no answer for a request."""
+
+
+class TrafficRecorder:
+    """Appends every request/response pair to a gzip-compressed JSON-lines archive.
+
+    Bodies are stored base64-encoded. Each line is flushed as it is written so
+    an interrupted session still leaves a readable archive.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = gzip.open(self.path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._handle.write(json.dumps({"__version__": ARCHIVE_VERSION, "created_at": time.time()}) + "\n")
+
+    def record(
+        self,
+        url: str,
+        request_headers: Mapping[str, str],
+        status: int,
+        reason: str,
+        headers: Mapping[str, str],
+        body: bytes,
+        elapsed: float,
+    ) -> None:
+        line = json.dumps(
+            {
+                "url": url,
+                "request_headers": {
+                    name: value for name, value in request_headers.items() if name.lower() not in _PRIVATE_HEADERS
+                },
+                "status": status,
+                "reason": reason,
+                "headers": dict(headers),
+                "body": base64.b64encode(body).decode("ascii"),
+                "elapsed": round(elapsed, 4),
+            },
+            separators=(",", ":"),
+        )
+        with self._lock:
+            if self._handle.closed:
+                return
+            self._handle.write(line + "\n")
+            self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._handle.closed:
+                self._handle.close()
+
+
+class TrafficReplayer:
+    """Serves responses from an archive written by :class:`TrafficRecorder`.
+
+    Requests are matched on the normalized URL. A URL recorded several times is
+    answered with its recordings in order, then the last one repeats.
+    ``latency`` adds a fixed delay to every answer.
+    """
+
+    def __init__(self, path: Union[str, Path], latency: float = 0.0) -> None:
+        self.path = Path(path)
+        self.latency = max(latency, 0.0)
+        self._responses: Dict[str, List[HttpResponse]] = {}
+        self._served: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def response(self, url: str) -> HttpResponse:
+        key = normalize_url(url)
+        with self._lock:
+            recorded = self._responses.get(key)
+            if not recorded:
+                raise ReplayError(f"No recorded response for {url}")
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            response = recorded[min(index, len(recorded) - 1)]
+        if self.latency:
+            time.sleep(self.latency)
+        return response
+
+    def _load(self) -> None:
+        lines: List[str] = []
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as handle:
+                try:
+                    for line in handle:
+                        lines.append(line)
+                except EOFError:
+                    # Recording was interrupted; keep every complete line before the cut.
+                    pass
+        except OSError as exc:
+            raise ReplayError(f"Cannot read archive {self.path}: {exc}") from exc
+        if not lines:
+            raise ReplayError(f"Archive {self.path} is empty")
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError as exc:
+            raise ReplayError(f"Archive {self.path} is corrupt") from exc
+        if not isinstance(header, dict) or header.get("__version__") != ARCHIVE_VERSION:
+            raise ReplayError(f"Archive {self.path} has an unsupported format")
+        for line in lines[1:]:
+            try:
+                item = json.loads(line)
+                response = HttpResponse(
+                    url=str(item["url"]),
+                    status=int(item["status"]),
+                    reason=str(item.get("reason", "")),
+                    headers=dict(item.get("headers") or {}),
+                    body=base64.b64decode(item.get("body", "")),
+                )
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                continue
+            self._responses.setdefault(normalize_url(response.url), []).append(response)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from .data import CurrencySnapshot
+
+DEFAULT_MIN_INTERVAL = 60.0
+DEFAULT_MAX_INTERVAL = 7200.0
+DEFAULT_REFRESH_BUDGET = 60  # foreground refreshes per hour, across every category
+BUDGET_WINDOW = 3600.0
+# Mean relative price change between consecutive snapshots that speeds up / slows down a key.
+VOLATILE_CHANGE = 0.02
+STAGNANT_CHANGE = 0.002
+SPEED_UP_FACTOR = 0.5
+SLOW_DOWN_FACTOR = 1.5
+TRACKED_ENTRIES = 50  # most valuable entries compared between snapshots
+
+
+def schedule_key(game: str, league: str, category: str, mode: str) -> str:
+    return "|".join(part.strip().lower() for part in (game, league, category, mode))
+
+
+class RefreshScheduler:
+    """Adapts the refresh interval of each (game, league, category, mode) to its volatility.
+
+    Every observed snapshot is compared with the previous one for the same key:
+    large average price moves halve the interval, near-zero moves stretch it by
+    half, always within ``[min_interval, max_interval]``. Independently, at most
+    ``budget`` refreshes are allowed per hour across all keys.
+    """
+
+    def __init__(
+        self,
+        base_interval: float,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        budget: int = DEFAULT_REFRESH_BUDGET,
+    ) -> None:
+        self.min_interval = max(min_interval, 1.0)
+        self.max_interval = max(max_interval, self.min_interval)
+        self.base_interval = base_interval
+        self.budget = max(budget, 1)
+        self._intervals: Dict[str, float] = {}
+        self._prices: Dict[str, Dict[str, float]] = {}
+        self._refreshes: Deque[float] = deque()
+        self._lock = threading.Lock()
+
+    def _clamp(self, interval: float) -> float:
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def interval(self, key: str) -> float:
+        with self._lock:
+            return self._intervals.get(key, self._clamp(self.base_interval))
+
+    def observe(self, key: str, snapshot: CurrencySnapshot) -> float:
+        """Record a fresh snapshot for ``key`` and return its next refresh interval."""
+        top = sorted(snapshot.entries, key=lambda entry: entry.chaos_value, reverse=True)[:TRACKED_ENTRIES]
+        prices = {entry.name: entry.chaos_value for entry in top if entry.chaos_value > 0}
+        with self._lock:
+            interval = self._intervals.get(key, self._clamp(self.base_interval))
+            previous = self._prices.get(key)
+            self._prices[key] = prices
+            if previous is not None:
+                change = _mean_relative_change(previous, prices)
+                if change is not None:
+                    if change >= VOLATILE_CHANGE:
+                        interval *= SPEED_UP_FACTOR
+                    elif change <= STAGNANT_CHANGE:
+                        interval *= SLOW_DOWN_FACTOR
+            interval = self._clamp(interval)
+            self._intervals[key] = interval
+        return interval
+
+    def try_acquire(self, now: Optional[float] = None) -> bool:
+        """Spend one refresh from the hourly budget; ``False`` when it is exhausted."""
+        now = time.time() if now is None else now
+        with self._lock:
+            while self._refreshes and now - self._refreshes[0] >= BUDGET_WINDOW:
+                self._refreshes.popleft()
+            if len(self._refreshes) >= self.budget:
+                return False
+            self._refreshes.append(now)
+            return True
+
+    def reset(self, base_interval: Optional[float] = None) -> None:
+        with self._lock:
+            if base_interval is not None:
+                self.base_interval = base_interval
+            self._intervals.clear()
+            self._prices.clear()
+
+
+def _mean_relative_change(previous: Dict[str, float], current: Dict[str, float]) -> Optional[float]:
+    changes = [abs(value - previous[name]) / previous[name] for name, value in current.items() if name in previous]
+    if not changes:
+        return None
+    return sum(changes) / len(changes)
@@ -5,6 +5,16 @@ import sys
 from pathlib import Path
 from typing import Any, Dict
 
+from .api import (
+    DEFAULT_DETAIL_CONCURRENCY,
+    DEFAULT_DETAIL_TTL,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_RATE,
+    MAX_DETAIL_CONCURRENCY,
+)
+from .prefetch import DEFAULT_PREFETCH_BUDGET, MAX_PREFETCH_BUDGET
+from .scheduler import DEFAULT_MAX_INTERVAL, DEFAULT_MIN_INTERVAL, DEFAULT_REFRESH_BUDGET
+
 CONFIG_FILE = Path(__file__).resolve().parent.parent / "tracker_config.json"
 
 DEFAULT_SETTINGS: Dict[str, Any] = {
@@ -14,6 +24,17 @@ DEFAULT_SETTINGS: Dict[str, Any] = {
     "limit": 50,
     "category": "Currency",
     "price_mode": "stash",
+    "detail_concurrency": DEFAULT_DETAIL_CONCURRENCY,
+    "request_rate": DEFAULT_REQUEST_RATE,
+    "request_burst": DEFAULT_REQUEST_BURST,
+    "prefetch_budget": DEFAULT_PREFETCH_BUDGET,
+    "min_interval": DEFAULT_MIN_INTERVAL,
+    "max_interval": DEFAULT_MAX_INTERVAL,
+    "refresh_budget": DEFAULT_REFRESH_BUDGET,
+    "detail_ttl": DEFAULT_DETAIL_TTL,
+    "lazy_details": False,
+    "projected_decoding": True,
+    "columnar_cache": True,
 }
 
 
@@ -46,6 +67,17 @@ def _prompt_initial_settings() -> Dict[str, Any]:
         "limit": DEFAULT_SETTINGS["limit"],
         "category": DEFAULT_SETTINGS["category"],
         "price_mode": DEFAULT_SETTINGS["price_mode"],
+        "detail_concurrency": DEFAULT_SETTINGS["detail_concurrency"],
+        "request_rate": DEFAULT_SETTINGS["request_rate"],
+        "request_burst": DEFAULT_SETTINGS["request_burst"],
+        "prefetch_budget": DEFAULT_SETTINGS["prefetch_budget"],
+        "min_interval": DEFAULT_SETTINGS["min_interval"],
+        "max_interval": DEFAULT_SETTINGS["max_interval"],
+        "refresh_budget": DEFAULT_SETTINGS["refresh_budget"],
+        "detail_ttl": DEFAULT_SETTINGS["detail_ttl"],
+        "lazy_details": DEFAULT_SETTINGS["lazy_details"],
+        "projected_decoding": DEFAULT_SETTINGS["projected_decoding"],
+        "columnar_cache": DEFAULT_SETTINGS["columnar_cache"],
     }
     print(f"Configuration saved to {CONFIG_FILE}.")
     return settings
@@ -81,6 +113,65 @@ def _validate_settings(settings: Dict[str, Any]) -> Dict[str, Any]:
     if price_mode not in {"stash", "exchange"}:
         price_mode = DEFAULT_SETTINGS["price_mode"]
     merged["price_mode"] = price_mode
+
+    try:
+        detail_concurrency = int(merged.get("detail_concurrency", DEFAULT_SETTINGS["detail_concurrency"]))
+    except (TypeError, ValueError):
+        detail_concurrency = DEFAULT_SETTINGS["detail_concurrency"]
+    merged["detail_concurrency"] = max(1, min(MAX_DETAIL_CONCURRENCY, detail_concurrency))
+
+    try:
+        request_rate = float(merged.get("request_rate", DEFAULT_SETTINGS["request_rate"]))
+    except (TypeError, ValueError):
+        request_rate = DEFAULT_SETTINGS["request_rate"]
+    merged["request_rate"] = max(0.1, min(20.0, request_rate))
+
+    try:
+        request_burst = int(merged.get("request_burst", DEFAULT_SETTINGS["request_burst"]))
+    except (TypeError, ValueError):
+        request_burst = DEFAULT_SETTINGS["request_burst"]
+    merged["request_burst"] = max(1, min(50, request_burst))
+
+    try:
+        prefetch_budget = int(merged.get("prefetch_budget", DEFAULT_SETTINGS["prefetch_budget"]))
+    except (TypeError, ValueError):
+        prefetch_budget = DEFAULT_SETTINGS["prefetch_budget"]
+    merged["prefetch_budget"] = max(0, min(MAX_PREFETCH_BUDGET, prefetch_budget))
+
+    try:
+        min_interval = float(merged.get("min_interval", DEFAULT_SETTINGS["min_interval"]))
+    except (TypeError, ValueError):
+        min_interval = DEFAULT_SETTINGS["min_interval"]
+    merged["min_interval"] = max(60.0, min_interval)
+
+    try:
+        max_interval = float(merged.get("max_interval", DEFAULT_SETTINGS["max_interval"]))
+    except (TypeError, ValueError):
+        max_interval = DEFAULT_SETTINGS["max_interval"]
+    merged["max_interval"] = max(merged["min_interval"], max_interval)
+
+    try:
+        refresh_budget = int(merged.get("refresh_budget", DEFAULT_SETTINGS["refresh_budget"]))
+    except (TypeError, ValueError):
+        refresh_budget = DEFAULT_SETTINGS["refresh_budget"]
+    merged["refresh_budget"] = max(1, min(3600, refresh_budget))
+
+    try:
+        detail_ttl = float(merged.get("detail_ttl", DEFAULT_SETTINGS["detail_ttl"]))
+    except (TypeError, ValueError):
+        detail_ttl = DEFAULT_SETTINGS["detail_ttl"]
+    merged["detail_ttl"] = max(0.0, min(86400.0, detail_ttl))
+
+    lazy_details = merged.get("lazy_details", DEFAULT_SETTINGS["lazy_details"])
+    merged["lazy_details"] = lazy_details if isinstance(lazy_details, bool) else DEFAULT_SETTINGS["lazy_details"]
+
+    projected_decoding = merged.get("projected_decoding", DEFAULT_SETTINGS["projected_decoding"])
+    if not isinstance(projected_decoding, bool):
+        projected_decoding = DEFAULT_SETTINGS["projected_decoding"]
+    merged["projected_decoding"] = projected_decoding
+
+    columnar_cache = merged.get("columnar_cache", DEFAULT_SETTINGS["columnar_cache"])
+    merged["columnar_cache"] = columnar_cache if isinstance(columnar_cache, bool) else DEFAULT_SETTINGS["columnar_cache"]
     return merged
 
 
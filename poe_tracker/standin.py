@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import random
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+DEFAULT_PORT = 8765
+DEFAULT_ITEMS = 60
+DEFAULT_UPDATE_INTERVAL = 60.0  # synthetic prices move once per interval
+SPARKLINE_POINTS = 7
+
+
+@dataclass
+class StandInOptions:
+    """Knobs of the stand-in server; rates are probabilities per request."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    error_rate: float = 0.0
+    not_found_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    items: int = DEFAULT_ITEMS
+    update_interval: float = DEFAULT_UPDATE_INTERVAL
+    fixtures: Optional[Path] = None
+    missing: Set[str] = field(default_factory=set)
+    seed: int = 0
+
+
+def _slug(name: str) -> str:
+    return "-".join(name.lower().split())
+
+
+def _item_names(category: str, count: int) -> List[str]:
+    names = ["Divine Orb", "Exalted Orb", "Chaos Orb"] if category.lower() == "currency" else []
+    index = 1
+    while len(names) < count:
+        names.append(f"{category} {index}")
+        index += 1
+    return names[:count]
+
+
+def _series(rng: random.Random) -> Tuple[List[float], float]:
+    points = [round(rng.uniform(-15.0, 15.0), 2) for _ in range(SPARKLINE_POINTS)]
+    return points, points[-1]
+
+
+def _priced_items(
+    options: StandInOptions, league: str, category: str, version: int
+) -> List[Tuple[str, str, float, List[float], float, int]]:
+    """(name, slug, chaos value, sparkline, total change, volume) rows shared by every generator."""
+    rows = []
+    for position, name in enumerate(_item_names(category, options.items)):
+        rng = random.Random(f"{options.seed}|{league}|{category}|{name}|{version}")
+        if name == "Divine Orb":
+            chaos = 150.0 + rng.uniform(-5.0, 5.0)
+        elif name == "Exalted Orb":
+            chaos = 12.0 + rng.uniform(-1.0, 1.0)
+        elif name == "Chaos Orb":
+            chaos = 1.0
+        else:
+            chaos = max(0.1, 400.0 / (position + 1) * rng.uniform(0.8, 1.2))
+        sparkline, change = _series(rng)
+        rows.append((name, _slug(name), round(chaos, 2), sparkline, change, rng.randint(5, 5000)))
+    return rows
+
+
+def currency_overview(options: StandInOptions, league: str, category: str, version: int) -> dict:
+    lines = []
+    details = []
+    for index, (name, slug, chaos, sparkline, change, volume) in enumerate(
+        _priced_items(options, league, category, version), start=1
+    ):
+        lines.append(
+            {
+                "currencyTypeName": name,
+                "chaosEquivalent": chaos,
+                "detailsId": slug,
+                "receive": {"count": volume, "value": chaos},
+                "receiveSparkLine": {"data": sparkline, "totalChange": change},
+            }
+        )
+        details.append({"id": index, "name": name, "tradeId": slug, "icon": f"https://web.poecdn.com/{slug}.png"})
+    return {"lines": lines, "currencyDetails": details}
+
+
+def item_overview(options: StandInOptions, league: str, category: str, version: int) -> dict:
+    rows = _priced_items(options, league, category, version)
+    divine = next((row[2] for row in rows if row[0] == "Divine Orb"), 150.0)
+    lines = []
+    for index, (name, slug, chaos, sparkline, change, volume) in enumerate(rows, start=1):
+        lines.append(
+            {
+                "id": index,
+                "name": name,
+                "icon": f"https://web.poecdn.com/{slug}.png",
+                "chaosValue": chaos,
+                "divineValue": round(chaos / divine, 4),
+                "detailsId": slug,
+                "listingCount": volume,
+                "sparkLine": {"data": sparkline, "totalChange": change},
+                # Fields the tracker ignores, shaped like poe.ninja's so payload sizes are realistic.
+                "baseType": f"{category} Base",
+                "itemClass": 1 + index % 6,
+                "levelRequired": 1 + index % 84,
+                "lowConfidenceSparkLine": {"data": sparkline, "totalChange": change},
+                "implicitModifiers": [{"text": f"+{index % 40} to maximum Life", "optional": False}],
+                "explicitModifiers": [
+                    {"text": f"+{(index + offset) % 90}% increased {stat}", "optional": False}
+                    for offset, stat in enumerate(("Armour", "Evasion Rating", "Energy Shield", "Rarity of Items found"))
+                ],
+                "flavourText": "The stand-in remembers every price it ever made up.",
+                "exaltedValue": round(chaos / 12.0, 4),
+                "tradeInfo": [],
+            }
+        )
+    return {"lines": lines, "language": {"name": "English", "translations": {}}}
+
+
+def exchange_overview(options: StandInOptions, league: str, category: str, version: int) -> dict:
+    rows = _priced_items(options, league, category, version)
+    divine = next((row[2] for row in rows if row[0] == "Divine Orb"), 150.0)
+    items = []
+    lines = []
+    for name, slug, chaos, sparkline, change, volume in rows:
+        items.append({"id": slug, "name": name, "detailsId": slug, "image": f"/gen/image/{slug}.png"})
+        lines.append(
+            {
+                "id": slug,
+                "primaryValue": round(chaos / divine, 6),
+                "volumePrimaryValue": volume,
+                "sparkline": {"data": sparkline, "totalChange": change},
+            }
+        )
+    return {
+        "core": {"primary": "divine", "secondary": "chaos", "rates": {"chaos": divine}},
+        "items": items,
+        "lines": lines,
+    }
+
+
+def exchange_details(options: StandInOptions, league: str, category: str, version: int, item_id: str) -> Optional[dict]:
+    for name, slug, chaos, sparkline, change, volume in _priced_items(options, league, category, version):
+        if slug == item_id:
+            return {
+                "item": {"id": slug, "name": name},
+                "line": {"id": slug, "chaosValue": chaos, "volume": volume},
+                "sparkLine": {"data": sparkline, "totalChange": change},
+            }
+    return None
+
+
+def temp_overview(options: StandInOptions, league: str, category: str, version: int) -> dict:
+    return {"items": item_overview(options, league, category, version)["lines"]}
+
+
+# Endpoint path suffix -> payload generator.
+_ROUTES: List[Tuple[str, Callable[..., Optional[dict]]]] = [
+    ("/api/data/currencyoverview", currency_overview),
+    ("/api/data/itemoverview", item_overview),
+    ("/poe1/api/economy/exchange/current/overview", exchange_overview),
+    ("/poe2/api/economy/exchange/current/overview", exchange_overview),
+    ("/poe2/api/economy/currencyexchange/overview", exchange_overview),
+    ("/poe2/api/economy/exchange/current/details", exchange_details),
+    ("/poe2/api/economy/currencyexchange/details", exchange_details),
+    ("/poe2/api/economy/temp/overview", temp_overview),
+    ("/poe2/api/economy/currencyoverview", currency_overview),
+]
+
+
+class StandInServer:
+    """Local HTTP server answering the poe.ninja endpoints used by the tracker.
+
+    Payloads come from ``options.fixtures`` when a matching file exists
+    (``<fixtures>/<endpoint path>/<category>.json``) and from deterministic
+    generators otherwise. Latency, 5xx/404/429 answers and payload size are
+    controlled through :class:`StandInOptions`. Responses carry an ETag and are
+    gzip-compressed when the client asks for it.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, options: Optional[StandInOptions] = None) -> None:
+        self.options = options or StandInOptions()
+        self._rng = random.Random(self.options.seed)
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+        self.stats: Dict[str, int] = {"requests": 0, "errors": 0, "not_found": 0, "rate_limited": 0}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StandInServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        self._httpd.serve_forever()
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _delay(self) -> float:
+        options = self.options
+        if not options.latency and not options.jitter:
+            return 0.0
+        with self._lock:
+            return max(0.0, options.latency + self._rng.uniform(-options.jitter, options.jitter))
+
+    def _version(self) -> int:
+        interval = self.options.update_interval
+        if interval <= 0:
+            return 0
+        return int((time.time() - self._started_at) // interval)
+
+    def respond(self, path: str, query: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Return (status, headers, body) for a request; used by the HTTP handler."""
+        options = self.options
+        self._count("requests")
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+        if options.rate_limit_rate and self._roll() < options.rate_limit_rate:
+            self._count("rate_limited")
+            return 429, {"Retry-After": f"{options.retry_after:g}"}, b"rate limited"
+        if options.error_rate and self._roll() < options.error_rate:
+            self._count("errors")
+            return 500, {}, b"internal error"
+        league = query.get("league") or query.get("leagueName") or ""
+        category = query.get("type") or query.get("overviewName") or ""
+        if category.lower() in options.missing or (options.not_found_rate and self._roll() < options.not_found_rate):
+            self._count("not_found")
+            return 404, {}, b"not found"
+        for suffix, generator in _ROUTES:
+            if not path.endswith(suffix):
+                continue
+            body = self._fixture(suffix, category)
+            if body is None:
+                version = self._version()
+                if generator is exchange_details:
+                    payload = exchange_details(options, league, category, version, query.get("id", ""))
+                else:
+                    payload = generator(options, league, category, version)
+                if payload is None:
+                    break
+                body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+            return 200, {"Content-Type": "application/json"}, body
+        self._count("not_found")
+        return 404, {}, b"not found"
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+    def _fixture(self, suffix: str, category: str) -> Optional[bytes]:
+        if self.options.fixtures is None or not category:
+            return None
+        path = self.options.fixtures / suffix.strip("/") / f"{category}.json"
+        try:
+            return path.read_bytes()
+        except OSError:
+            return None
+
+    def _handler_class(self) -> type:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002 - stdlib signature
+                return
+
+            def do_GET(self) -> None:
+                parts = urllib.parse.urlsplit(self.path)
+                query = dict(urllib.parse.parse_qsl(parts.query))
+                status, headers, body = server.respond(parts.path, query)
+                if status == 200:
+                    etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                    headers["ETag"] = etag
+                    if self.headers.get("If-None-Match") == etag:
+                        status, body = 304, b""
+                    elif "gzip" in (self.headers.get("Accept-Encoding") or ""):
+                        body = gzip.compress(body, compresslevel=5)
+                        headers["Content-Encoding"] = "gzip"
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return _Handler
+
+
+def build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m poe_tracker.standin",
+        description="Local stand-in for the poe.ninja API, for load and latency testing.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- seconds around --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--not-found-rate", type=float, default=0.0, help="Fraction of requests answered with 404")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429 answers")
+    parser.add_argument("--items", type=int, default=DEFAULT_ITEMS, help="Rows per synthetic overview (payload size)")
+    parser.add_argument(
+        "--update-interval",
+        type=float,
+        default=DEFAULT_UPDATE_INTERVAL,
+        help="Seconds between synthetic price changes, 0 keeps prices fixed",
+    )
+    parser.add_argument("--fixtures", type=Path, default=None, help="Directory of recorded JSON payloads to serve")
+    parser.add_argument(
+        "--missing",
+        action="append",
+        default=[],
+        metavar="CATEGORY",
+        help="Category that always answers 404 (repeatable)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Seed for synthetic data and failure injection")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_argument_parser().parse_args(argv)
+    options = StandInOptions(
+        latency=max(args.latency, 0.0),
+        jitter=max(args.jitter, 0.0),
+        error_rate=args.error_rate,
+        not_found_rate=args.not_found_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        items=max(args.items, 1),
+        update_interval=args.update_interval,
+        fixtures=args.fixtures,
+        missing={name.strip().lower() for name in args.missing},
+        seed=args.seed,
+    )
+    server = StandInServer(args.host, args.port, options)
+    print(f"Serving poe.ninja stand-in on {server.base_url} (use --base-url {server.base_url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
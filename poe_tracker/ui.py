@@ -1,22 +1,39 @@
 from __future__ import annotations
 
 import curses
+import queue
 import re
+import threading
 import time
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
 from .api import (
     ApiError,
+    DEFAULT_DETAIL_CONCURRENCY,
+    DEFAULT_DETAIL_TTL,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_REQUEST_RATE,
+    apply_exchange_detail,
     fetch_currency_snapshot,
+    fetch_exchange_detail,
     POE_CURRENCY_OVERVIEW_TYPES,
     POE_ITEM_OVERVIEW_TYPES,
     POE2_FALLBACK_OVERVIEWS,
     POE2_OVERVIEW_ALIASES,
+    circuit_states,
 )
 from .cache import DEFAULT_CACHE_TTL, SnapshotCache
 from .data import CurrencyEntry, CurrencySnapshot
 from .graph import render_graph_block
+from .prefetch import DEFAULT_PREFETCH_BUDGET, CategoryPrefetcher, DetailLoader, window_order
+from .scheduler import (
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_REFRESH_BUDGET,
+    RefreshScheduler,
+    schedule_key,
+)
 from .settings import save_settings
 
 
@@ -29,6 +46,21 @@ class TrackerConfig:
     refresh_interval: float = 120.0
     poe_ninja_cookie: Optional[str] = None
     price_mode: str = "stash"
+    detail_concurrency: int = DEFAULT_DETAIL_CONCURRENCY
+    request_rate: float = DEFAULT_REQUEST_RATE
+    request_burst: int = DEFAULT_REQUEST_BURST
+    prefetch_budget: int = DEFAULT_PREFETCH_BUDGET
+    min_interval: float = DEFAULT_MIN_INTERVAL
+    max_interval: float = DEFAULT_MAX_INTERVAL
+    refresh_budget: int = DEFAULT_REFRESH_BUDGET
+    detail_ttl: float = DEFAULT_DETAIL_TTL
+    lazy_details: bool = False
+    projected_decoding: bool = True
+    columnar_cache: bool = True
+    record_path: Optional[str] = None
+    replay_path: Optional[str] = None
+    replay_latency: float = 0.0
+    base_url: Optional[str] = None
     settings: Optional[Dict[str, Any]] = None
 
 
@@ -57,6 +89,17 @@ class TrackerUI:
             "limit": config.limit,
             "category": config.category,
             "price_mode": config.price_mode,
+            "detail_concurrency": config.detail_concurrency,
+            "request_rate": config.request_rate,
+            "request_burst": config.request_burst,
+            "prefetch_budget": config.prefetch_budget,
+            "min_interval": config.min_interval,
+            "max_interval": config.max_interval,
+            "refresh_budget": config.refresh_budget,
+            "detail_ttl": config.detail_ttl,
+            "lazy_details": config.lazy_details,
+            "projected_decoding": config.projected_decoding,
+            "columnar_cache": config.columnar_cache,
         }
         self.config.settings = self._settings
         self.game = (self.config.game or "poe2").strip().lower()
@@ -69,31 +112,66 @@ class TrackerUI:
         if self.category_cycle:
             self.config.category = self.category_cycle[self.category_index]
         cache_ttl = max(self.config.refresh_interval, DEFAULT_CACHE_TTL)
-        self.snapshot_cache = SnapshotCache(ttl=cache_ttl)
+        # A replay starts from an empty cache and leaves the one live runs use untouched.
+        self.snapshot_cache = SnapshotCache(
+            ttl=cache_ttl,
+            columnar=self.config.columnar_cache,
+            persistent=not self.config.replay_path,
+        )
         self._force_refresh = False
+        self._refresh_results: "queue.Queue[tuple[int, Optional[CurrencySnapshot], Optional[ApiError]]]" = queue.Queue()
+        self._refresh_generation = 0
+        self._pending_refresh: Optional[int] = None
         self.info_message: Optional[tuple[str, float]] = None
         self.search_active = False
         self.search_query = ""
         self.search_results: list[DisplayEntry] = []
         self.scroll_offset = 0
         self._exalt_baseline: Optional[float] = None
+        self.prefetcher = CategoryPrefetcher(
+            self._prefetch_fetch,
+            self._prefetch_needed,
+            self._store_prefetched,
+            budget=self.config.prefetch_budget,
+            window=self.config.refresh_interval,
+        )
+        self._prefetch_anchor: Optional[tuple] = None
+        # Cache keys of PoE2 categories prefetched without exchange details while eager details are on.
+        self._partial_keys: set[str] = set()
+        self.refresh_scheduler = RefreshScheduler(
+            self.config.refresh_interval,
+            min_interval=self.config.min_interval,
+            max_interval=self.config.max_interval,
+            budget=self.config.refresh_budget,
+        )
+        self._prefetched_seen = 0
+        self.detail_loader = DetailLoader(self._load_detail, self._deliver_detail)
+        self._detail_results: "queue.Queue[tuple[tuple[str, str], str, dict]]" = queue.Queue()
+        self._detail_anchor: Optional[tuple] = None
 
     def run(self, stdscr: "curses._CursesWindow") -> None:
         self._initialize_curses(stdscr)
         try:
             while not self.should_exit:
+                self._drain_refresh_results()
+                self._drain_detail_results()
                 now = time.time()
                 force_refresh = self._force_refresh
-                if (
-                    force_refresh
-                    or self.snapshot is None
-                    or (now - self.last_refresh) >= self.config.refresh_interval
-                ):
-                    self._refresh_data(force=force_refresh)
-                    self._force_refresh = False
+                timed_refresh = self.snapshot is not None and (now - self.last_refresh) >= self._refresh_interval()
+                if self._pending_refresh is None and (force_refresh or self.snapshot is None or timed_refresh):
+                    # Only timer-driven refreshes spend the hourly budget; explicit ones always run.
+                    if force_refresh or self.snapshot is None or self.refresh_scheduler.try_acquire(now):
+                        # A manual refresh also skips the on-disk response cache.
+                        self._refresh_data(force=force_refresh or timed_refresh, use_cache=not force_refresh)
+                        self._force_refresh = False
+                self._update_prefetch()
+                self._update_detail_window()
                 self._render(stdscr)
                 self._handle_input(stdscr)
         finally:
+            self.prefetcher.close()
+            self.detail_loader.close()
+            self.snapshot_cache.flush()
             self._persist_settings()
             self._teardown_curses()
 
@@ -191,7 +269,7 @@ class TrackerUI:
         self.category_cycle.append(cleaned)
         return len(self.category_cycle) - 1
 
-    def _refresh_data(self, force: bool = False) -> None:
+    def _refresh_data(self, force: bool = False, use_cache: bool = True) -> None:
         normalized_category = self._normalize_category(self.config.category)
         now = time.time()
 
@@ -202,53 +280,134 @@ class TrackerUI:
             self.snapshot = cached_snapshot
             self.selected_index = min(self.selected_index, max(0, len(cached_snapshot.entries) - 1))
             self.error_message = None
-            self.last_refresh = now
+            # The refresh timer runs from the age of the data, not from when it was shown.
+            self.last_refresh = min(now, cached_snapshot.fetched_at)
             self._refresh_search_results()
+            self._complete_prefetched(cache_key)
             return
 
+        self._start_refresh(use_cache)
+
+    def _complete_prefetched(self, cache_key: str) -> None:
+        # A category prefetched without its exchange details gets them once it is on screen.
+        if cache_key in self._partial_keys:
+            self._partial_keys.discard(cache_key)
+            if self._pending_refresh is None:
+                self._start_refresh()
+
+    def _start_refresh(self, use_cache: bool = True) -> None:
+        """Fetch the current category on a worker thread; the result arrives via ``_refresh_results``."""
+        self._refresh_generation += 1
+        generation = self._refresh_generation
+        self._pending_refresh = generation
+        request = (
+            self.config.league,
+            self.config.category,
+            self.config.game,
+            self.config.poe_ninja_cookie,
+            self.price_mode,
+            self.config.detail_concurrency,
+            self.config.lazy_details,
+            use_cache,
+        )
+        worker = threading.Thread(
+            target=self._refresh_worker,
+            args=(generation, request),
+            name="snapshot-refresh",
+            daemon=True,
+        )
+        worker.start()
+
+    def _refresh_worker(self, generation: int, request: tuple) -> None:
+        league, category, game, ninja_cookie, price_mode, detail_concurrency, lazy_details, use_cache = request
         try:
             snapshot = fetch_currency_snapshot(
-                self.config.league,
-                self.config.category,
-                game=self.config.game,
-                ninja_cookie=self.config.poe_ninja_cookie,
-                price_mode=self.price_mode,
+                league,
+                category,
+                game=game,
+                ninja_cookie=ninja_cookie,
+                price_mode=price_mode,
+                detail_concurrency=detail_concurrency,
+                lazy_details=lazy_details,
+                use_cache=use_cache,
             )
-            self._ensure_exalted_values(snapshot)
-            self.snapshot = snapshot
-            self.snapshot_cache.set(cache_key, snapshot)
-            self.selected_index = min(self.selected_index, max(0, len(snapshot.entries) - 1))
-            self.error_message = None
-            self.last_refresh = now
-            self._refresh_search_results()
         except ApiError as exc:
-            message = str(exc)
-            self.error_message = f"Fetch failed: {message}"
-            self.last_refresh = now
-            self.snapshot_cache.remove(cache_key)
-            if self.game == "poe" and self.price_mode == "exchange":
-                self.price_mode_index = 0
-                self.price_mode = self._price_modes[self.price_mode_index]
-                self.config.price_mode = self.price_mode
-                fallback = self._get_cached_snapshot(normalized_category, self.price_mode)
-                if fallback:
-                    self._ensure_exalted_values(fallback)
-                    self.snapshot = fallback
-                    self.error_message = None
-                    self._set_info_message("Exchange prices unavailable; showing stash data.")
-                    self.last_refresh = now
-                    self._refresh_search_results()
-                    return
-                else:
-                    self._set_info_message("Exchange prices unavailable.")
-            removable_patterns = ("No data returned", "HTTP Error 404", "404: Not Found")
-            if (
-                any(pattern in message for pattern in removable_patterns)
-                and self.price_mode == "stash"
-                and self._remove_category(normalized_category)
-            ):
+            self._refresh_results.put((generation, None, exc))
+        else:
+            self._refresh_results.put((generation, snapshot, None))
+
+    def _cancel_refresh(self) -> None:
+        # The request itself cannot be interrupted; bumping the generation discards its result.
+        self._refresh_generation += 1
+        self._pending_refresh = None
+
+    def _drain_refresh_results(self) -> None:
+        while True:
+            try:
+                generation, snapshot, error = self._refresh_results.get_nowait()
+            except queue.Empty:
+                return
+            if generation != self._pending_refresh:
+                continue
+            self._pending_refresh = None
+            if snapshot is not None:
+                self._apply_refreshed_snapshot(snapshot)
+            elif error is not None:
+                self._handle_refresh_error(error)
+
+    def _schedule_key(self) -> str:
+        return schedule_key(self.game, self.config.league, self._normalize_category(self.config.category), self.price_mode)
+
+    def _refresh_interval(self) -> float:
+        return self.refresh_scheduler.interval(self._schedule_key())
+
+    def _apply_refreshed_snapshot(self, snapshot: CurrencySnapshot) -> None:
+        normalized_category = self._normalize_category(self.config.category)
+        self.refresh_scheduler.observe(self._schedule_key(), snapshot)
+        self._ensure_exalted_values(snapshot)
+        self._partial_keys.discard(self._cache_key(normalized_category))
+        # Show the cached form so in-place detail updates reach the cache. The file is written
+        # on the cache's save timer, never on the curses thread.
+        self.snapshot = self.snapshot_cache.set(self._cache_key(normalized_category), snapshot, persist=False)
+        self._cache_companions(normalized_category, snapshot)
+        self.snapshot_cache.persist_later()
+        self.selected_index = min(self.selected_index, max(0, len(snapshot.entries) - 1))
+        self.error_message = None
+        self.last_refresh = time.time()
+        self._refresh_search_results()
+
+    def _handle_refresh_error(self, exc: ApiError) -> None:
+        normalized_category = self._normalize_category(self.config.category)
+        cache_key = self._cache_key(normalized_category)
+        now = time.time()
+        message = str(exc)
+        self.error_message = f"Fetch failed: {message}"
+        self.last_refresh = now
+        self.snapshot_cache.remove(cache_key, persist=False)
+        self.snapshot_cache.persist_later()
+        if self.game == "poe" and self.price_mode == "exchange":
+            self.price_mode_index = 0
+            self.price_mode = self._price_modes[self.price_mode_index]
+            self.config.price_mode = self.price_mode
+            fallback = self._get_cached_snapshot(normalized_category, self.price_mode)
+            if fallback:
+                self._ensure_exalted_values(fallback)
+                self.snapshot = fallback
                 self.error_message = None
+                self._set_info_message("Exchange prices unavailable; showing stash data.")
+                self.last_refresh = now
+                self._refresh_search_results()
                 return
+            else:
+                self._set_info_message("Exchange prices unavailable.")
+        removable_patterns = ("No data returned", "HTTP Error 404", "404: Not Found")
+        if (
+            any(pattern in message for pattern in removable_patterns)
+            and self.price_mode == "stash"
+            and self._remove_category(normalized_category)
+        ):
+            self.error_message = None
+            return
 
     def _handle_input(self, stdscr: "curses._CursesWindow") -> None:
         key = stdscr.getch()
@@ -312,14 +471,8 @@ class TrackerUI:
     def _cycle_category(self, delta: int) -> None:
         if not self.category_cycle:
             return
-        original_index = self.category_index
-        for _ in range(len(self.category_cycle)):
-            next_index = (self.category_index + delta) % len(self.category_cycle)
-            target = self.category_cycle[next_index]
-            if self._switch_category(target):
-                return
-            self.category_index = next_index
-        self.category_index = original_index
+        next_index = (self.category_index + delta) % len(self.category_cycle)
+        self._switch_category(self.category_cycle[next_index])
 
     def _toggle_price_mode(self) -> None:
         if self.game != "poe" or len(self._price_modes) <= 1:
@@ -328,19 +481,22 @@ class TrackerUI:
         self.price_mode_index = (self.price_mode_index + 1) % len(self._price_modes)
         self.price_mode = self._price_modes[self.price_mode_index]
         self.config.price_mode = self.price_mode
+        self._cancel_refresh()
         self.snapshot = None
         self.selected_index = 0
         self.scroll_offset = 0
         self.last_refresh = 0.0
-        self._force_refresh = True
+        # No forced refresh: a cached snapshot for the new mode (e.g. the stash data
+        # fetched alongside an exchange refresh) is shown without a round-trip.
         self._set_info_message(f"Price mode: {self.price_mode.title()}")
 
-    def _switch_category(self, category_name: str, prefer_cache: bool = True) -> bool:
+    def _switch_category(self, category_name: str, prefer_cache: bool = True) -> None:
+        # Never fails: without cached data the fetch is scheduled, and a category that has
+        # no data is dropped once that fetch fails.
         normalized = self._normalize_category(category_name)
-        if not category_name:
-            return False
         if self._normalize_category(self.config.category) == normalized and self.snapshot:
-            return True
+            return
+        self._cancel_refresh()
         self.category_index = self._locate_category_index(category_name)
         self.config.category = self.category_cycle[self.category_index]
         self.selected_index = 0
@@ -350,12 +506,12 @@ class TrackerUI:
                 self.snapshot = cached
                 self.selected_index = min(self.selected_index, max(0, len(cached.entries) - 1))
                 self.error_message = None
-                self.last_refresh = time.time()
-                return True
+                self.last_refresh = min(time.time(), cached.fetched_at)
+                self._complete_prefetched(self._cache_key(normalized))
+                return
         self.snapshot = None
         self.last_refresh = 0.0
         self._refresh_data()
-        return self.snapshot is not None
 
     def _remove_category(self, normalized_category: str) -> bool:
         if not self.category_cycle:
@@ -365,9 +521,10 @@ class TrackerUI:
                 self.category_cycle.pop(idx)
                 if self.game == "poe":
                     for mode in self._price_modes:
-                        self.snapshot_cache.remove(self._cache_key(normalized_category, mode))
+                        self.snapshot_cache.remove(self._cache_key(normalized_category, mode), persist=False)
                 else:
-                    self.snapshot_cache.remove(normalized_category)
+                    self.snapshot_cache.remove(normalized_category, persist=False)
+                self.snapshot_cache.persist_later()
                 if not self.category_cycle:
                     self.config.category = ""
                     self.snapshot = None
@@ -382,6 +539,118 @@ class TrackerUI:
                 return True
         return False
 
+    def _cache_companions(self, normalized_category: str, snapshot: CurrencySnapshot) -> None:
+        # An exchange refresh also downloads the stash overview; keep it so toggling modes is instant.
+        companions = dict(snapshot.companions)
+        snapshot.companions.clear()
+        for mode, companion in companions.items():
+            if mode in self._price_modes and mode != self.price_mode:
+                self._ensure_exalted_values(companion)
+                self.snapshot_cache.set(self._cache_key(normalized_category, mode), companion, persist=False)
+
+    def _prefetch_context(self) -> tuple[str, str, str]:
+        return (self.game, self.config.league, self.price_mode)
+
+    def _update_prefetch(self) -> None:
+        # Wait for the category on screen, and for any foreground fetch, before spending
+        # requests on its neighbours.
+        if self.snapshot is None or self._pending_refresh is not None or not self.category_cycle:
+            self.prefetcher.suspend()
+            return
+        self.prefetcher.resume()
+        anchor = (self._prefetch_context(), self.category_index, len(self.category_cycle))
+        if anchor != self._prefetch_anchor:
+            self._prefetch_anchor = anchor
+            self.prefetcher.schedule(anchor[0], list(self.category_cycle), self.category_index)
+        prefetched = self.prefetcher.stats()["prefetched"]
+        if prefetched != self._prefetched_seen:
+            self._prefetched_seen = prefetched
+            self._refresh_search_results()
+
+    def _prefetch_needed(self, context: tuple[str, str, str], category: str) -> bool:
+        if context != self._prefetch_context():
+            return False
+        return self.snapshot_cache.get(self._cache_key(self._normalize_category(category), context[2])) is None
+
+    def _prefetch_fetch(self, context: tuple[str, str, str], category: str) -> CurrencySnapshot:
+        game, league, mode = context
+        # Without exchange details a PoE2 category costs a few overview requests instead of
+        # dozens of detail calls; eager mode fetches the details once the category is shown.
+        return fetch_currency_snapshot(
+            league,
+            category,
+            game=game,
+            ninja_cookie=self.config.poe_ninja_cookie,
+            price_mode=mode,
+            detail_concurrency=self.config.detail_concurrency,
+            lazy_details=True,
+        )
+
+    def _store_prefetched(self, context: tuple[str, str, str], category: str, snapshot: CurrencySnapshot) -> None:
+        # Runs on the prefetch thread; results for a game/league/mode the user has left are dropped.
+        if context != self._prefetch_context():
+            return
+        normalized = self._normalize_category(category)
+        companions = dict(snapshot.companions)
+        snapshot.companions.clear()
+        # Written on a timer rather than per category, so warming a long cycle is not one rewrite each.
+        cache_key = self._cache_key(normalized, context[2])
+        self.snapshot_cache.set(cache_key, snapshot, persist=False)
+        if context[0] == "poe2" and not self.config.lazy_details:
+            self._partial_keys.add(cache_key)
+        for mode, companion in companions.items():
+            if mode in self._price_modes and mode != context[2]:
+                self.snapshot_cache.set(self._cache_key(normalized, mode), companion, persist=False)
+        self.snapshot_cache.persist_later()
+
+    def _detail_context(self) -> tuple[str, str]:
+        return (self.config.league, self.config.category)
+
+    def _update_detail_window(self) -> None:
+        # Lazy mode only: load exchange details for the selected row and its neighbours.
+        if not self.config.lazy_details or self.game != "poe2" or self.search_query or self.snapshot is None:
+            if self._detail_anchor is not None:
+                self._detail_anchor = None
+                self.detail_loader.cancel()
+            return
+        entries = self._current_entries()
+        ids = [
+            entries[index].entry.details_id
+            for index in window_order(len(entries), self.selected_index)
+            if entries[index].entry.details_id
+        ]
+        anchor = (self._detail_context(), id(self.snapshot), tuple(ids))
+        if anchor != self._detail_anchor:
+            self._detail_anchor = anchor
+            self.detail_loader.schedule(anchor[0], ids)
+
+    def _load_detail(self, context: tuple[str, str], details_id: str) -> Optional[dict]:
+        league, category = context
+        return fetch_exchange_detail(league, category, details_id, ninja_cookie=self.config.poe_ninja_cookie)
+
+    def _deliver_detail(self, context: tuple[str, str], details_id: str, detail: dict) -> None:
+        # Runs on the loader thread; the UI thread merges the detail in ``_drain_detail_results``.
+        self._detail_results.put((context, details_id, detail))
+
+    def _drain_detail_results(self) -> None:
+        applied = False
+        while True:
+            try:
+                context, details_id, detail = self._detail_results.get_nowait()
+            except queue.Empty:
+                break
+            if context != self._detail_context() or self.snapshot is None:
+                continue
+            league, category = context
+            for entry in self.snapshot.entries:
+                if entry.details_id == details_id and apply_exchange_detail(league, category, entry, detail):
+                    applied = True
+        if applied:
+            # The cached snapshot is the one on screen, so it only needs writing out; a timer
+            # thread does that once for a burst of details instead of the UI thread per detail.
+            self._ensure_exalted_values(self.snapshot)
+            self.snapshot_cache.persist_later()
+
     def _get_cached_snapshot(self, normalized_category: str, mode: Optional[str] = None) -> Optional[CurrencySnapshot]:
         cache_key = self._cache_key(normalized_category, mode)
         snapshot = self.snapshot_cache.get(cache_key)
@@ -467,16 +736,14 @@ class TrackerUI:
             return False
         if not target:
             return False
-        if self._switch_category(target):
-            self.search_query = ""
-            self.search_results = []
-            self.search_active = False
-            self.scroll_offset = 0
-            self._clamp_selection()
-            self._set_info_message(f"Category set to '{target}'")
-            return True
-        self._set_info_message(f"Unable to load category '{target}'")
-        return False
+        self._switch_category(target)
+        self.search_query = ""
+        self.search_results = []
+        self.search_active = False
+        self.scroll_offset = 0
+        self._clamp_selection()
+        self._set_info_message(f"Category set to '{target}'")
+        return True
 
     def _collect_search_results(self, query: str) -> list[DisplayEntry]:
         if not query:
@@ -492,9 +759,8 @@ class TrackerUI:
             mode_label = cache_mode or "stash"
             if cache_mode and cache_mode != "stash":
                 display_name = f"{display_name} ({cache_mode.title()})"
-            for entry in snapshot.entries:
-                if needle in entry.name.lower():
-                    matches.append(DisplayEntry(display_name, normalized, entry, price_mode=mode_label))
+            for entry in snapshot.matching_entries(needle):
+                matches.append(DisplayEntry(display_name, normalized, entry, price_mode=mode_label))
         matches.sort(key=lambda item: item.entry.chaos_value, reverse=True)
         limit = max(self.config.limit, 1)
         return matches[:limit]
@@ -546,16 +812,18 @@ class TrackerUI:
         self.selected_index = max(0, min(self.selected_index, len(entries) - 1))
         self.scroll_offset = max(0, min(self.scroll_offset, max(0, len(entries) - 1)))
 
-    def _compute_exalted_values(self, entries: List[CurrencyEntry]) -> None:
-        exalt_price = self._extract_exalt_price(entries)
+    def _compute_exalted_values(self, snapshot: CurrencySnapshot) -> None:
+        listed_price = self._extract_exalt_price(snapshot.entries)
+        exalt_price = listed_price
         if exalt_price is None:
             exalt_price = self._get_currency_baseline()
         else:
             self._exalt_baseline = exalt_price
         if exalt_price is None or exalt_price <= 0:
             return
-        for entry in entries:
-            entry.exalt_value = (entry.chaos_value / exalt_price) if entry.chaos_value else None
+        snapshot.apply_exalt_price(exalt_price)
+        snapshot.exalt_basis = exalt_price
+        snapshot.exalt_basis_listed = listed_price is not None
 
     def _extract_exalt_price(self, entries: List[CurrencyEntry]) -> Optional[float]:
         def _maybe_update(current: Optional[float], candidate: float) -> float:
@@ -618,7 +886,11 @@ class TrackerUI:
     def _ensure_exalted_values(self, snapshot: CurrencySnapshot) -> None:
         if not snapshot or not snapshot.entries:
             return
-        self._compute_exalted_values(snapshot.entries)
+        basis = snapshot.exalt_basis
+        if basis is not None and (snapshot.exalt_basis_listed or basis == self._exalt_baseline):
+            # Already derived from its own Exalted Orb line or from the current baseline.
+            return
+        self._compute_exalted_values(snapshot)
 
     def _set_info_message(self, message: str) -> None:
         if not message:
@@ -822,7 +1094,15 @@ class TrackerUI:
             if self.game == "poe":
                 info_parts.append(f"Mode: {self.price_mode.title()}")
             info_parts.append(f"Last update: {last_update}")
-            info_parts.append(f"Refresh: {int(self.config.refresh_interval)}s")
+            info_parts.append(f"Refresh: {int(self._refresh_interval())}s")
+            if self._pending_refresh is not None:
+                info_parts.append("Refreshing…")
+            pending = self.prefetcher.pending()
+            if pending:
+                info_parts.append(f"Prefetching: {pending} left")
+            loading = self.detail_loader.pending()
+            if loading:
+                info_parts.append(f"Details: {loading} left")
             if info_parts:
                 lines.append(" | ".join(info_parts))
 
@@ -837,10 +1117,20 @@ class TrackerUI:
             lines.append(controls)
         else:
             status = "Connecting to PoE Ninja..."
+            if self._pending_refresh is not None and self.config.category:
+                status = f"Refreshing {self.config.category}…"
             if self.game == "poe":
                 status = f"Mode: {self.price_mode.title()} | {status}"
             lines.append(status)
 
+        open_circuits = [
+            f"{name} {state}" + (f" ({int(wait)}s)" if wait else "")
+            for name, (state, wait) in circuit_states().items()
+            if state != "closed"
+        ]
+        if open_circuits:
+            lines[0] += " | Circuit: " + ", ".join(open_circuits)
+
         if self.info_message:
             message, ts = self.info_message
             if time.time() - ts < 6:
@@ -1057,6 +1347,8 @@ class TrackerUI:
             changed = True
             self.config.refresh_interval = interval
             self.snapshot_cache.ttl = max(interval, DEFAULT_CACHE_TTL)
+            self.prefetcher.window = max(interval, 1.0)
+            self.refresh_scheduler.reset(interval)
 
         if limit != self.config.limit:
             changed = True
@@ -1074,6 +1366,7 @@ class TrackerUI:
             )
             save_settings(self._settings)
             self.config.settings = self._settings
+            self._cancel_refresh()
             self.snapshot = None
             self._force_refresh = True
             self.last_refresh = 0.0